@@ -1,6 +1,7 @@
 """
 API Routes for Crypto Prediction Engine
 """
+import asyncio
 from datetime import datetime, timedelta
 from typing import Optional, List
 from fastapi import APIRouter, HTTPException, Query, Request
@@ -20,6 +21,11 @@ class PredictionRequest(BaseModel):
     horizon_minutes: int = Field(default=5, ge=1, le=60, description="Prediction horizon in minutes")
 
 
+class BatchPredictionRequest(BaseModel):
+    """Request model for batch prediction endpoint."""
+    requests: List[PredictionRequest] = Field(min_length=1, max_length=10, description="Predictions to generate")
+
+
 class ConePoint(BaseModel):
     """Single point in the prediction cone."""
     timestamp: datetime
@@ -200,6 +206,49 @@ async def predict(request: PredictionRequest, req: Request):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@router.post("/predict/batch", response_model=List[PredictionResponse])
+async def predict_batch(request: BatchPredictionRequest, req: Request):
+    """
+    Generate predictions for several assets/horizons in one call.
+    
+    Trained models are evaluated once for the whole batch.
+    """
+    try:
+        model_service = req.app.state.model_service
+        data_service = req.app.state.data_service
+        tracker = req.app.state.prediction_tracker
+        
+        # Get latest market data for all requested assets concurrently
+        market_data = await asyncio.gather(
+            *(data_service.get_latest_data(r.asset) for r in request.requests)
+        )
+        
+        # Generate predictions
+        predictions = await model_service.predict_batch([
+            (r.asset, r.horizon_minutes, md)
+            for r, md in zip(request.requests, market_data)
+        ])
+        
+        # Log predictions for tracking (only if horizon is reasonable)
+        for r, md, prediction in zip(request.requests, market_data, predictions):
+            if r.horizon_minutes <= 10:
+                tracker.log_prediction(
+                    asset=r.asset,
+                    entry_price=md["price"],
+                    p_up=prediction["p_up"],
+                    expected_move=prediction["expected_move"],
+                    horizon_minutes=r.horizon_minutes,
+                    regime=prediction["regime"],
+                    confidence=prediction["confidence"],
+                )
+        
+        return predictions
+        
+    except Exception as e:
+        logger.error(f"Batch prediction error: {e}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
 @router.post("/market-data", response_model=MarketDataResponse)
 async def get_market_data(request: MarketDataRequest, req: Request):
     """
@@ -7,6 +7,7 @@ from typing import AsyncGenerator
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, ORJSONResponse
 from loguru import logger
 import uvicorn
 
@@ -17,6 +18,13 @@ from services.data_service import DataService
 from services.model_service import ModelService
 from services.prediction_tracker import PredictionTracker
 
+try:
+    import orjson  # noqa: F401 - ORJSONResponse needs it at render time
+    DefaultResponse = ORJSONResponse
+except ImportError:
+    DefaultResponse = JSONResponse
+    logger.warning("orjson not available, using stdlib JSON responses")
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator:
@@ -33,6 +41,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     
     # Load models
     await app.state.model_service.load_models()
+    await app.state.data_service.warm_up()
     
     # Start background tasks
     if settings.enable_websocket:
@@ -61,6 +70,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
             await app.state.tracker_task
         except asyncio.CancelledError:
             pass
+    app.state.prediction_tracker.close()
     
     if hasattr(app.state, 'data_task'):
         app.state.data_task.cancel()
@@ -78,6 +88,7 @@ app = FastAPI(
     description="Next-generation crypto prediction terminal API",
     version="1.0.0",
     lifespan=lifespan,
+    default_response_class=DefaultResponse,
 )
 
 # CORS middleware
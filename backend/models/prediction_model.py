@@ -167,7 +167,7 @@ class DirectionModel:
         }
         
         with open(path, "wb") as f:
-            pickle.dump(data, f)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         logger.info(f"Direction model saved to {path}")
     
@@ -288,7 +288,7 @@ class MagnitudeModel:
         }
         
         with open(path, "wb") as f:
-            pickle.dump(data, f)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         logger.info(f"Magnitude model saved to {path}")
     
@@ -194,7 +194,7 @@ class GARCHVolatilityModel:
         }
         
         with open(path, "wb") as f:
-            pickle.dump(data, f)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
         
         logger.info(f"Volatility model saved to {path}")
     
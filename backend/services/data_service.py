@@ -6,8 +6,10 @@ Supports:
 - Coinglass for aggregated derivatives metrics (public v2 API)
 """
 import asyncio
+import math
+import time
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import aiohttp
 from loguru import logger
 import numpy as np
@@ -15,6 +17,55 @@ import pandas as pd
 
 from core.config import settings
 
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+    logger.warning("orjson not available, using stdlib json decoder")
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available, using NumPy statistics kernels")
+
+
+if NUMBA_AVAILABLE:
+    @njit(cache=True, fastmath=True)
+    def _returns_nb(close, periods):
+        """Log return between close[-periods] and close[-1]."""
+        return math.log(close[-1] / close[-periods])
+    
+    @njit(cache=True, fastmath=True)
+    def _volatility_nb(close, periods):
+        """Sample std of the last `periods` log returns, scaled by sqrt(periods)."""
+        n = close.shape[0]
+        start = max(1, n - periods)
+        count = 0
+        mean = 0.0
+        m2 = 0.0
+        for i in range(start, n):
+            r = math.log(close[i] / close[i - 1])
+            count += 1
+            delta = r - mean
+            mean += delta / count
+            m2 += delta * (r - mean)
+        if count < 2:
+            return np.nan
+        return math.sqrt(m2 / (count - 1)) * math.sqrt(periods)
+    
+    @njit(cache=True, fastmath=True)
+    def _cvd_nb(open_, close, volume):
+        """Signed USD volume delta summed over all candles."""
+        acc = 0.0
+        for i in range(close.shape[0]):
+            if close[i] >= open_[i]:
+                acc += volume[i] * close[i]
+            else:
+                acc -= volume[i] * close[i]
+        return acc
+
 
 class DataService:
     """Service for fetching and managing market data."""
@@ -27,6 +78,13 @@ class DataService:
     MEXC_FUTURES_URL = "https://contract.mexc.com"
     COINGLASS_V2_URL = "https://open-api.coinglass.com/public/v2"
     
+    # Pre-built endpoint URLs
+    COINGLASS_OI_URL = f"{COINGLASS_V2_URL}/open_interest"
+    COINGLASS_FUNDING_URL = f"{COINGLASS_V2_URL}/funding"
+    COINGLASS_LIQ_INFO_URL = f"{COINGLASS_V2_URL}/liquidation_info"
+    COINGLASS_LIQ_CHART_URL = f"{COINGLASS_V2_URL}/liquidation_chart"
+    MEXC_FUNDING_RATE_URL = f"{MEXC_FUTURES_URL}/api/v1/contract/funding_rate/"
+    
     # Symbol mappings per exchange
     SYMBOL_MAP = {
         "coinbase": {
@@ -54,6 +112,7 @@ class DataService:
             "BNB": "BNB",
         }
     }
+    COINGLASS_SYMBOLS = SYMBOL_MAP["coinglass"]
     
     INTERVAL_MAP_COINBASE = {
         "1m": 60, "3m": 180, "5m": 300, "10m": 600, "15m": 900,
@@ -65,88 +124,265 @@ class DataService:
         "1h": 60, "4h": 240, "1d": 1440,
     }
     
+    OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+    
+    # Column positions inside each exchange's raw candle rows
+    COINBASE_CANDLE_COLUMNS = {
+        "timestamp": 0, "open": 3, "high": 2, "low": 1, "close": 4, "volume": 5,
+    }
+    KRAKEN_CANDLE_COLUMNS = {
+        "timestamp": 0, "open": 1, "high": 2, "low": 3, "close": 4, "volume": 6,
+    }
+    
+    RING_CANDLE_COLUMNS = {
+        "timestamp": 0, "open": 1, "high": 2, "low": 3, "close": 4, "volume": 5,
+    }
+    
+    # Per-asset 1m candle history kept in memory
+    RING_SIZE = 1440            # One day of 1m candles
+    RING_INTERVAL_SECONDS = 60
+    RING_MAX_AGE_SECONDS = 15   # Older than this and get_latest_data refetches
+    LATEST_WINDOW = 100         # Candles used for the latest-data statistics
+    
+    # Assets refreshed by the background streaming loop
+    STREAM_ASSETS = ("BTC", "ETH", "SOL")
+    STREAM_INTERVAL_SECONDS = 5.0
+    STREAM_MAX_BACKOFF_SECONDS = 60.0
+    
+    # Base liquidation estimates by asset (typical 24h values in USD)
+    BASE_LIQUIDATIONS = {
+        "BTC": 150_000_000.0,  # $150M base
+        "ETH": 80_000_000.0,   # $80M base
+        "SOL": 30_000_000.0,   # $30M base
+        "BNB": 20_000_000.0,   # $20M base
+    }
+    DEFAULT_BASE_LIQUIDATIONS = 10_000_000.0
+    
+    # Minimum refresh interval per derivatives endpoint (seconds).
+    # Coinglass aggregates update on the order of minutes.
+    DERIVATIVES_TTL = {
+        "open_interest": 60,
+        "funding_rate": 300,
+        "liquidations": 60,
+    }
+    
+    # HTTP connection pool (one keep-alive pool shared by all fetchers)
+    HTTP_POOL_LIMIT = 100
+    HTTP_POOL_LIMIT_PER_HOST = 10
+    HTTP_DNS_CACHE_TTL = 300
+    HTTP_KEEPALIVE_TIMEOUT = 60
+    # Socket-level connect/read bounds, so time spent waiting for a free pool
+    # slot does not count against the connect budget
+    HTTP_TIMEOUT = aiohttp.ClientTimeout(total=15, sock_connect=2, sock_read=3)
+    
+    # Upper bound for each Coinglass request; fallbacks get their own budget
+    COINGLASS_TIMEOUT = aiohttp.ClientTimeout(total=3.0)
+    
     def __init__(self):
         self.session: Optional[aiohttp.ClientSession] = None
+        self._connector: Optional[aiohttp.TCPConnector] = None
         self._cache: Dict[str, Any] = {}
         self._derivatives_cache: Dict[str, Any] = {}
+        self._deriv_fetched_at: Dict[Tuple[str, str], float] = {}  # (asset, kind) -> monotonic
+        
+        # 1m candle ring buffers: asset -> (RING_SIZE, 6) rows of [ts, o, h, l, c, v]
+        self._ring: Dict[str, np.ndarray] = {}
+        self._ring_head: Dict[str, int] = {}
+        self._ring_count: Dict[str, int] = {}
+        self._ring_updated: Dict[str, float] = {}  # asset -> monotonic
         self._running = False
+        self._failures = 0
+        
+        # Coinglass request headers never change at runtime - build them once
+        self._cg_headers = {"accept": "application/json"}
+        if settings.coinglass_api_key:
+            self._cg_headers["coinglassSecret"] = settings.coinglass_api_key
+    
+    async def __aenter__(self) -> "DataService":
+        await self._get_session()
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
     
     async def _get_session(self) -> aiohttp.ClientSession:
-        """Get or create HTTP session."""
+        """Get or create the shared keep-alive HTTP session."""
         if self.session is None or self.session.closed:
-            self.session = aiohttp.ClientSession()
+            self._connector = aiohttp.TCPConnector(
+                limit=self.HTTP_POOL_LIMIT,
+                limit_per_host=self.HTTP_POOL_LIMIT_PER_HOST,
+                ttl_dns_cache=self.HTTP_DNS_CACHE_TTL,
+                keepalive_timeout=self.HTTP_KEEPALIVE_TIMEOUT,
+            )
+            self.session = aiohttp.ClientSession(
+                connector=self._connector,
+                timeout=self.HTTP_TIMEOUT,
+                headers={"accept": "application/json"},
+            )
         return self.session
     
     async def close(self):
-        """Close HTTP session."""
+        """Close HTTP session and its connection pool."""
         if self.session and not self.session.closed:
             await self.session.close()
+        if self._connector and not self._connector.closed:
+            await self._connector.close()
+        self._connector = None
+    
+    async def warm_up(self):
+        """Pay the JIT compile cost of the numba kernels at startup, off the event loop."""
+        if NUMBA_AVAILABLE:
+            await asyncio.to_thread(self._warm_kernels)
+    
+    def _warm_kernels(self):
+        # Same argument types as the live calls: contiguous writable float64 arrays
+        close = np.linspace(1.0, 2.0, 4)
+        self._calculate_returns(close, 2)
+        self._calculate_volatility(close, 2)
+        self._calculate_cvd(close, close.copy(), close.copy())
     
     async def start_streaming(self):
         """Start background data streaming."""
         self._running = True
+        self._failures = 0
         logger.info("Starting data streaming (Coinbase + Coinglass)...")
+        loop = asyncio.get_running_loop()
         
         while self._running:
-            try:
-                for asset in ["BTC", "ETH", "SOL"]:
-                    await self._update_cache(asset)
-                    await self._update_derivatives_cache(asset)
-                
-                await asyncio.sleep(5)
-                
-            except Exception as e:
-                logger.error(f"Streaming error: {e}")
-                await asyncio.sleep(10)
+            cycle_start = loop.time()
+            
+            # All per-asset refreshes are independent I/O - run them concurrently.
+            # Each update logs its own errors and reports success, or None if it had nothing to do.
+            tasks = [self._update_cache(a) for a in self.STREAM_ASSETS]
+            tasks += [self._update_derivatives_cache(a) for a in self.STREAM_ASSETS]
+            attempted = [ok for ok in await asyncio.gather(*tasks) if ok is not None]
+            
+            if attempted and not any(attempted):
+                # Whole cycle failed (e.g. network down) - back off instead of hammering the APIs
+                self._failures += 1
+                backoff = min(self.STREAM_MAX_BACKOFF_SECONDS, 10 * self._failures)
+                logger.error(f"Streaming cycle failed ({self._failures} in a row), retrying in {backoff:.0f}s")
+                await asyncio.sleep(backoff)
+                continue
+            
+            self._failures = 0
+            # Hold a fixed cadence: only sleep for what is left of the cycle
+            elapsed = loop.time() - cycle_start
+            await asyncio.sleep(max(0.0, self.STREAM_INTERVAL_SECONDS - elapsed))
     
-    async def _update_cache(self, asset: str):
-        """Update spot data cache."""
+    async def _update_cache(self, asset: str) -> bool:
+        """Update spot data cache. Returns whether fresh candles were stored."""
         try:
-            data = await self._fetch_coinbase_candles(asset, "1m", 10)
-            if data:
-                self._cache[f"{asset}_latest"] = data[-1]
+            df = await self._fetch_coinbase_candles(asset, "1m", 10)
+            if not df.empty:
+                self._ring_write(asset, df)
+                self._cache[f"{asset}_latest"] = self._df_to_klines(df.iloc[-1:])[0]
                 self._cache[f"{asset}_updated"] = datetime.utcnow()
+                return True
         except Exception as e:
             logger.warning(f"Spot cache update failed for {asset}: {e}")
+        return False
     
-    async def _update_derivatives_cache(self, asset: str):
-        """Update derivatives data cache from Coinglass."""
+    async def _update_derivatives_cache(self, asset: str) -> Optional[bool]:
+        """
+        Update derivatives data cache from Coinglass.
+        
+        Returns whether any stale endpoint was refreshed, or None if none was stale.
+        """
         try:
-            # Fetch from Coinglass (aggregated data)
-            oi_task = self._fetch_coinglass_open_interest(asset)
-            funding_task = self._fetch_coinglass_funding(asset)
-            liq_task = self._fetch_coinglass_liquidations(asset)
+            # Fetch from Coinglass (aggregated data), skipping endpoints still within TTL
+            fetchers = {
+                "open_interest": self._fetch_coinglass_open_interest,
+                "funding_rate": self._fetch_coinglass_funding,
+                "liquidations": self._fetch_coinglass_liquidations,
+            }
+            now = time.monotonic()
+            stale = [
+                kind for kind in fetchers
+                if now - self._deriv_fetched_at.get((asset, kind), -float("inf")) >= self.DERIVATIVES_TTL[kind]
+            ]
             
-            oi_data, funding_data, liq_data = await asyncio.gather(
-                oi_task, funding_task, liq_task,
+            results = await asyncio.gather(
+                *(fetchers[kind](asset) for kind in stale),
                 return_exceptions=True
             )
             
-            self._derivatives_cache[asset] = {
-                "open_interest": oi_data if not isinstance(oi_data, Exception) else None,
-                "funding_rate": funding_data if not isinstance(funding_data, Exception) else None,
-                "liquidations": liq_data if not isinstance(liq_data, Exception) else None,
-                "updated": datetime.utcnow(),
-            }
+            entry = dict(self._derivatives_cache.get(asset, {}))
+            refreshed = False
+            for kind, result in zip(stale, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    # Transient - keep the last known good value
+                    logger.debug(f"Coinglass {kind} fetch timed out for {asset}")
+                elif isinstance(result, Exception) or result is None:
+                    entry[kind] = None
+                else:
+                    entry[kind] = result
+                    self._deriv_fetched_at[(asset, kind)] = now
+                    refreshed = True
+            entry["updated"] = datetime.utcnow()
+            
+            self._derivatives_cache[asset] = entry
+            
+            if stale:
+                # One summary line per refresh; only formatted if INFO is enabled
+                logger.opt(lazy=True).info(
+                    "Coinglass {} derivs: {}", lambda: asset, lambda: self._derivatives_summary(entry)
+                )
+                return refreshed
+            return None
             
         except Exception as e:
             logger.warning(f"Derivatives cache update failed for {asset}: {e}")
+            return False
+    
+    @staticmethod
+    def _derivatives_summary(entry: Dict[str, Any]) -> str:
+        """Format a cached derivatives entry for logging."""
+        oi = entry.get("open_interest")
+        funding = entry.get("funding_rate")
+        liqs = entry.get("liquidations")
+        
+        parts = [
+            f"OI ${oi['total_oi']/1e9:.2f}B ({oi['change_24h']*100:+.2f}%)" if oi else "OI n/a",
+            f"Funding {funding['avg_rate']*100:.4f}%" if funding else "Funding n/a",
+            f"Liqs L${liqs['long_24h']/1e6:.1f}M/S${liqs['short_24h']/1e6:.1f}M" if liqs else "Liqs n/a",
+        ]
+        return ", ".join(parts)
     
     async def get_latest_data(self, asset: str) -> Dict[str, Any]:
         """Get latest market data including derivatives."""
-        klines = await self._fetch_coinbase_candles(asset, "1m", 100)
-        if not klines:
-            klines = await self._fetch_kraken_candles(asset, "1m", 100)
-        
-        if not klines:
-            raise ValueError(f"Failed to fetch spot data for {asset}")
-        
-        latest = klines[-1]
-        df = self._klines_to_dataframe(klines)
+        # Serve from the streamed ring buffer when it is fresh, else fetch and seed it
+        if not self._ring_is_fresh(asset):
+            fetched = await self._fetch_coinbase_candles(asset, "1m", self.LATEST_WINDOW)
+            if fetched.empty:
+                fetched = await self._fetch_kraken_candles(asset, "1m", self.LATEST_WINDOW)
+            
+            if fetched.empty:
+                raise ValueError(f"Failed to fetch spot data for {asset}")
+            
+            self._ring_write(asset, fetched)
+        
+        # Pull each column out once as a contiguous array and share it across the stats
+        ts, open_, high, low, close, volume = np.ascontiguousarray(
+            self._ring_view(asset, self.LATEST_WINDOW).T
+        )
+        day_close = None
+        if self._ring_count.get(asset, 0) >= self.RING_SIZE:
+            day_close = np.ascontiguousarray(self._ring_view(asset, self.RING_SIZE)[:, 4])
+        
+        latest = {
+            "timestamp": pd.to_datetime(ts[-1], unit="s"),
+            "open": float(open_[-1]),
+            "high": float(high[-1]),
+            "low": float(low[-1]),
+            "close": float(close[-1]),
+            "volume": float(volume[-1]),
+        }
+        now = datetime.utcnow()
         
         # Get derivatives data from cache or fetch fresh
         deriv = self._derivatives_cache.get(asset, {})
-        if not deriv or (datetime.utcnow() - deriv.get("updated", datetime.min)) > timedelta(seconds=30):
+        if not deriv or (now - deriv.get("updated", datetime.min)) > timedelta(seconds=30):
             await self._update_derivatives_cache(asset)
             deriv = self._derivatives_cache.get(asset, {})
         
@@ -156,7 +392,7 @@ class DataService:
         
         return {
             "asset": asset,
-            "timestamp": datetime.utcnow(),
+            "timestamp": now,
             "price": float(latest["close"]),
             "ohlcv": latest,
             "funding_rate": funding_data.get("avg_rate") if funding_data else None,
@@ -164,10 +400,10 @@ class DataService:
             "oi_change_24h": oi_data.get("change_24h") if oi_data else None,
             "long_liquidations_24h": liq_data.get("long_24h") if liq_data else None,
             "short_liquidations_24h": liq_data.get("short_24h") if liq_data else None,
-            "returns_1h": self._calculate_returns(df, 60),
-            "returns_24h": self._calculate_returns(df, 1440) if len(df) >= 1440 else None,
-            "volatility_1h": self._calculate_volatility(df, 60),
-            "cvd": self._calculate_cvd(df),
+            "returns_1h": self._calculate_returns(close, 60),
+            "returns_24h": self._calculate_returns(day_close, 1440) if day_close is not None else None,
+            "volatility_1h": self._calculate_volatility(close, 60),
+            "cvd": self._calculate_cvd(close, open_, volume),
         }
     
     async def get_historical_data(
@@ -177,21 +413,14 @@ class DataService:
         limit: int
     ) -> Dict[str, Any]:
         """Get historical OHLCV and market structure data."""
-        klines = await self._fetch_coinbase_candles(asset, interval, limit)
-        if not klines:
-            klines = await self._fetch_kraken_candles(asset, interval, limit)
+        df = await self._fetch_coinbase_candles(asset, interval, limit)
+        if df.empty:
+            df = await self._fetch_kraken_candles(asset, interval, limit)
         
-        if not klines:
+        if df.empty:
             raise ValueError(f"Failed to fetch data for {asset}")
         
-        candles = [{
-            "timestamp": k["timestamp"] if isinstance(k["timestamp"], datetime) else datetime.fromtimestamp(k["timestamp"]),
-            "open": float(k["open"]),
-            "high": float(k["high"]),
-            "low": float(k["low"]),
-            "close": float(k["close"]),
-            "volume": float(k["volume"]),
-        } for k in klines]
+        candles = self._df_to_klines(df)
         
         # Get current derivatives data
         deriv = self._derivatives_cache.get(asset, {})
@@ -199,33 +428,30 @@ class DataService:
         funding_data = deriv.get("funding_rate", {})
         liq_data = deriv.get("liquidations", {})
         
-        # Calculate per-candle volume delta in USD (for chart display)
-        # Also track cumulative for the final CVD value
-        cvd_cumulative = 0.0
-        delta_values = []  # Per-candle delta for visualization
-        for c in candles:
-            # Direction: +1 if bullish candle, -1 if bearish
-            direction = 1 if c["close"] >= c["open"] else -1
-            # Volume delta in USD
-            delta_usd = c["volume"] * c["close"] * direction
-            cvd_cumulative += delta_usd
-            delta_values.append(delta_usd)  # Store per-candle delta, not cumulative
-        
-        # Build market structure with derivatives
-        market_structure = []
-        for i, candle in enumerate(candles):
-            is_recent = i >= len(candles) - 10
-            
-            ms = {
-                "timestamp": candle["timestamp"],
-                "funding_rate": funding_data.get("avg_rate") if is_recent and funding_data else None,
-                "open_interest": oi_data.get("total_oi") if is_recent and oi_data else None,
-                "oi_change_pct": oi_data.get("change_24h") if is_recent and oi_data else None,
-                "long_liquidations": liq_data.get("long_24h") / 24 if is_recent and liq_data and liq_data.get("long_24h") else None,
-                "short_liquidations": liq_data.get("short_24h") / 24 if is_recent and liq_data and liq_data.get("short_24h") else None,
-                "cvd": delta_values[i],  # Per-candle delta for chart visualization
-            }
-            market_structure.append(ms)
+        # Per-candle volume delta in USD (for chart display), not cumulative
+        close = df["close"].to_numpy(dtype=np.float64, copy=False)
+        open_ = df["open"].to_numpy(dtype=np.float64, copy=False)
+        volume = df["volume"].to_numpy(dtype=np.float64, copy=False)
+        delta_values = np.where(close >= open_, volume, -volume) * close
+        
+        # Derivatives snapshot is only attached to the most recent candles
+        recent_values = {
+            "funding_rate": funding_data.get("avg_rate") if funding_data else None,
+            "open_interest": oi_data.get("total_oi") if oi_data else None,
+            "oi_change_pct": oi_data.get("change_24h") if oi_data else None,
+            "long_liquidations": liq_data.get("long_24h") / 24 if liq_data and liq_data.get("long_24h") else None,
+            "short_liquidations": liq_data.get("short_24h") / 24 if liq_data and liq_data.get("short_24h") else None,
+        }
+        
+        # Build market structure column-wise, then bulk-assign the recent rows
+        ms_df = pd.DataFrame({"timestamp": df.index})
+        for col in recent_values:
+            ms_df[col] = None
+        ms_df["cvd"] = delta_values
+        for col, value in recent_values.items():
+            if value is not None:
+                ms_df.iloc[-10:, ms_df.columns.get_loc(col)] = value
+        market_structure = ms_df.to_dict(orient="records")
         
         return {
             "asset": asset,
@@ -244,7 +470,7 @@ class DataService:
     
     async def _fetch_coinbase_candles(
         self, asset: str, interval: str, limit: int
-    ) -> List[Dict]:
+    ) -> pd.DataFrame:
         """Fetch candles from Coinbase."""
         session = await self._get_session()
         symbol = self.SYMBOL_MAP["coinbase"].get(asset, f"{asset}-USD")
@@ -263,25 +489,15 @@ class DataService:
         try:
             async with session.get(url, params=params) as response:
                 if response.status != 200:
-                    return []
-                
-                data = await response.json()
-                candles = []
-                for c in reversed(data):
-                    candles.append({
-                        "timestamp": datetime.fromtimestamp(c[0]),
-                        "open": float(c[3]),
-                        "high": float(c[2]),
-                        "low": float(c[1]),
-                        "close": float(c[4]),
-                        "volume": float(c[5]),
-                    })
+                    return self._candles_to_dataframe([], self.COINBASE_CANDLE_COLUMNS)
                 
-                return candles
+                data = await response.json(loads=json_loads)
+                # Coinbase returns newest first
+                return self._candles_to_dataframe(data[::-1], self.COINBASE_CANDLE_COLUMNS)
                 
         except Exception as e:
             logger.error(f"Coinbase error: {e}")
-            return []
+            return self._candles_to_dataframe([], self.COINBASE_CANDLE_COLUMNS)
     
     # ========================================================================
     # Kraken API (Spot - USA Friendly Fallback)
@@ -289,7 +505,7 @@ class DataService:
     
     async def _fetch_kraken_candles(
         self, asset: str, interval: str, limit: int
-    ) -> List[Dict]:
+    ) -> pd.DataFrame:
         """Fetch candles from Kraken."""
         session = await self._get_session()
         symbol = self.SYMBOL_MAP["kraken"].get(asset, f"{asset}USD")
@@ -301,34 +517,22 @@ class DataService:
         try:
             async with session.get(url, params=params) as response:
                 if response.status != 200:
-                    return []
+                    return self._candles_to_dataframe([], self.KRAKEN_CANDLE_COLUMNS)
                 
-                data = await response.json()
+                data = await response.json(loads=json_loads)
                 if data.get("error"):
-                    return []
+                    return self._candles_to_dataframe([], self.KRAKEN_CANDLE_COLUMNS)
                 
                 result = data.get("result", {})
                 pair_key = [k for k in result.keys() if k != 'last'][0] if result else None
                 if not pair_key:
-                    return []
+                    return self._candles_to_dataframe([], self.KRAKEN_CANDLE_COLUMNS)
                 
-                ohlc_data = result[pair_key]
-                candles = []
-                for c in ohlc_data[-limit:]:
-                    candles.append({
-                        "timestamp": datetime.fromtimestamp(c[0]),
-                        "open": float(c[1]),
-                        "high": float(c[2]),
-                        "low": float(c[3]),
-                        "close": float(c[4]),
-                        "volume": float(c[6]),
-                    })
-                
-                return candles
+                return self._candles_to_dataframe(result[pair_key][-limit:], self.KRAKEN_CANDLE_COLUMNS)
                 
         except Exception as e:
             logger.error(f"Kraken error: {e}")
-            return []
+            return self._candles_to_dataframe([], self.KRAKEN_CANDLE_COLUMNS)
     
     # ========================================================================
     # Coinglass Public V2 API (Aggregated Derivatives Data)
@@ -337,32 +541,29 @@ class DataService:
     async def _fetch_coinglass_open_interest(self, asset: str) -> Optional[Dict]:
         """Fetch aggregated open interest from Coinglass."""
         session = await self._get_session()
-        symbol = self.SYMBOL_MAP["coinglass"].get(asset, asset)
-        
-        url = f"{self.COINGLASS_V2_URL}/open_interest"
+        symbol = self.COINGLASS_SYMBOLS.get(asset, asset)
         params = {"symbol": symbol}
         
-        headers = {"accept": "application/json"}
-        if settings.coinglass_api_key:
-            headers["coinglassSecret"] = settings.coinglass_api_key
-        
         try:
-            async with session.get(url, params=params, headers=headers) as response:
+            async with session.get(self.COINGLASS_OI_URL, params=params, headers=self._cg_headers,
+                                   timeout=self.COINGLASS_TIMEOUT) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     
                     if data.get("code") == "0" and data.get("data"):
-                        # Find the "All" exchange entry (aggregated)
-                        for item in data["data"]:
-                            if item.get("exchangeName") == "All":
-                                total_oi = float(item.get("openInterest", 0))
-                                change_24h = float(item.get("h24Change", 0)) / 100
-                                
-                                logger.info(f"Coinglass OI for {asset}: ${total_oi/1e9:.2f}B ({change_24h*100:+.2f}%)")
-                                return {
-                                    "total_oi": total_oi,
-                                    "change_24h": change_24h,
-                                }
+                        # Index entries by exchange (first occurrence wins) and take "All" (aggregated)
+                        by_exchange = {it.get("exchangeName"): it for it in reversed(data["data"])}
+                        item = by_exchange.get("All")
+                        if item is not None:
+                            total_oi = float(item.get("openInterest", 0))
+                            change_24h = float(item.get("h24Change", 0)) / 100
+                            
+                            return {
+                                "total_oi": total_oi,
+                                "change_24h": change_24h,
+                            }
+        except asyncio.TimeoutError:
+            raise  # No fallback for OI - let the cache keep its last value
         except Exception as e:
             logger.debug(f"Coinglass OI error: {e}")
         
@@ -372,32 +573,29 @@ class DataService:
         """Fetch aggregated funding rates from Coinglass."""
         session = await self._get_session()
         
-        url = f"{self.COINGLASS_V2_URL}/funding"
-        
-        headers = {"accept": "application/json"}
-        if settings.coinglass_api_key:
-            headers["coinglassSecret"] = settings.coinglass_api_key
-        
         try:
-            async with session.get(url, headers=headers) as response:
+            async with session.get(self.COINGLASS_FUNDING_URL, headers=self._cg_headers,
+                                   timeout=self.COINGLASS_TIMEOUT) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     
                     if data.get("code") == "0" and data.get("data"):
-                        # Find the asset
-                        for item in data["data"]:
-                            if item.get("symbol") == asset:
-                                # Get weighted average from uMarginList
-                                u_margin = item.get("uMarginList", [])
-                                if u_margin:
-                                    rates = [float(ex.get("rate", 0)) for ex in u_margin if ex.get("rate")]
-                                    if rates:
-                                        avg_rate = sum(rates) / len(rates)
-                                        logger.info(f"Coinglass Funding for {asset}: {avg_rate*100:.4f}%")
-                                        return {
-                                            "avg_rate": avg_rate,
-                                            "exchanges": u_margin,
-                                        }
+                        # Index entries by symbol (first occurrence wins) and look up the asset
+                        by_symbol = {it.get("symbol"): it for it in reversed(data["data"])}
+                        item = by_symbol.get(asset)
+                        # Get weighted average from uMarginList
+                        u_margin = item.get("uMarginList", []) if item is not None else []
+                        if u_margin:
+                            rates = np.fromiter(
+                                (float(ex["rate"]) for ex in u_margin if ex.get("rate")),
+                                dtype=np.float64,
+                            )
+                            if rates.size:
+                                avg_rate = float(rates.mean())
+                                return {
+                                    "avg_rate": avg_rate,
+                                    "exchanges": u_margin,
+                                }
         except Exception as e:
             logger.debug(f"Coinglass funding error: {e}")
         
@@ -407,19 +605,14 @@ class DataService:
     async def _fetch_coinglass_liquidations(self, asset: str) -> Optional[Dict]:
         """Fetch liquidation data from Coinglass."""
         session = await self._get_session()
-        symbol = self.SYMBOL_MAP["coinglass"].get(asset, asset)
-        
-        url = f"{self.COINGLASS_V2_URL}/liquidation_info"
+        symbol = self.COINGLASS_SYMBOLS.get(asset, asset)
         params = {"symbol": symbol, "time_type": "h24"}
         
-        headers = {"accept": "application/json"}
-        if settings.coinglass_api_key:
-            headers["coinglassSecret"] = settings.coinglass_api_key
-        
         try:
-            async with session.get(url, params=params, headers=headers) as response:
+            async with session.get(self.COINGLASS_LIQ_INFO_URL, params=params, headers=self._cg_headers,
+                                   timeout=self.COINGLASS_TIMEOUT) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     
                     if data.get("code") == "0" and data.get("data"):
                         liq = data["data"]
@@ -429,7 +622,6 @@ class DataService:
                         short_24h = float(liq.get("shortLiquidationUsd", liq.get("sellVolUsd", 0)))
                         
                         if long_24h > 0 or short_24h > 0:
-                            logger.info(f"Coinglass Liqs for {asset}: Long ${long_24h/1e6:.1f}M, Short ${short_24h/1e6:.1f}M")
                             return {
                                 "long_24h": long_24h,
                                 "short_24h": short_24h,
@@ -440,22 +632,28 @@ class DataService:
         
         # Try liquidation chart endpoint
         try:
-            url2 = f"{self.COINGLASS_V2_URL}/liquidation_chart"
-            params2 = {"symbol": symbol, "time_type": "h24"}
-            
-            async with session.get(url2, params=params2, headers=headers) as response:
+            async with session.get(self.COINGLASS_LIQ_CHART_URL, params=params, headers=self._cg_headers,
+                                   timeout=self.COINGLASS_TIMEOUT) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     
                     if data.get("code") == "0" and data.get("data"):
                         liq_list = data["data"]
                         if isinstance(liq_list, list) and liq_list:
                             # Sum the last 24 hours
-                            long_total = sum(float(l.get("longLiquidationUsd", l.get("buyVolUsd", 0))) for l in liq_list)
-                            short_total = sum(float(l.get("shortLiquidationUsd", l.get("sellVolUsd", 0))) for l in liq_list)
+                            n = len(liq_list)
+                            longs = np.fromiter(
+                                (float(l.get("longLiquidationUsd", l.get("buyVolUsd", 0))) for l in liq_list),
+                                dtype=np.float64, count=n,
+                            )
+                            shorts = np.fromiter(
+                                (float(l.get("shortLiquidationUsd", l.get("sellVolUsd", 0))) for l in liq_list),
+                                dtype=np.float64, count=n,
+                            )
+                            long_total = float(longs.sum())
+                            short_total = float(shorts.sum())
                             
                             if long_total > 0 or short_total > 0:
-                                logger.info(f"Coinglass Liqs (chart) for {asset}: Long ${long_total/1e6:.1f}M, Short ${short_total/1e6:.1f}M")
                                 return {
                                     "long_24h": long_total,
                                     "short_24h": short_total,
@@ -475,12 +673,10 @@ class DataService:
         session = await self._get_session()
         symbol = self.SYMBOL_MAP["mexc"].get(asset, f"{asset}_USDT")
         
-        url = f"{self.MEXC_FUTURES_URL}/api/v1/contract/funding_rate/{symbol}"
-        
         try:
-            async with session.get(url) as response:
+            async with session.get(self.MEXC_FUNDING_RATE_URL + symbol) as response:
                 if response.status == 200:
-                    data = await response.json()
+                    data = await response.json(loads=json_loads)
                     if data.get("success") and data.get("data"):
                         rate = float(data["data"].get("fundingRate", 0))
                         return {"avg_rate": rate}
@@ -491,26 +687,20 @@ class DataService:
     
     async def _estimate_liquidations(self, asset: str) -> Optional[Dict]:
         """Estimate liquidations based on price volatility."""
-        klines = await self._fetch_coinbase_candles(asset, "1h", 24)
-        if not klines:
+        df = await self._fetch_coinbase_candles(asset, "1h", 24)
+        if df.empty:
             return None
         
-        df = self._klines_to_dataframe(klines)
-        volatility = self._calculate_volatility(df, 24)
+        # Writable copy - a read-only view would compile a second kernel signature
+        volatility = self._calculate_volatility(df["close"].to_numpy(dtype=np.float64, copy=True), 24)
         
         if volatility is None:
             return None
         
         # Rough estimate based on market cap and volatility
-        price = float(klines[-1]["close"])
+        price = float(df["close"].iloc[-1])
         
-        # Base liquidation estimates by asset (typical 24h values in millions USD)
-        base_liq = {
-            "BTC": 150_000_000,  # $150M base
-            "ETH": 80_000_000,   # $80M base
-            "SOL": 30_000_000,   # $30M base
-            "BNB": 20_000_000,   # $20M base
-        }.get(asset, 10_000_000)
+        base_liq = self.BASE_LIQUIDATIONS.get(asset, self.DEFAULT_BASE_LIQUIDATIONS)
         
         # Scale by volatility (higher vol = more liquidations)
         vol_multiplier = volatility / 0.02  # Normalize to 2% vol
@@ -527,35 +717,99 @@ class DataService:
     # Helper Methods
     # ========================================================================
     
-    def _klines_to_dataframe(self, klines: List[Dict]) -> pd.DataFrame:
-        """Convert klines to DataFrame."""
-        df = pd.DataFrame(klines)
-        if "timestamp" in df.columns and not df.empty:
-            df = df.set_index("timestamp")
-        for col in ["open", "high", "low", "close", "volume"]:
-            if col in df.columns:
-                df[col] = df[col].astype(float)
-        return df
-    
-    def _calculate_returns(self, df: pd.DataFrame, periods: int) -> Optional[float]:
+    def _candles_to_dataframe(
+        self, rows: List[List[Any]], columns: Dict[str, int]
+    ) -> pd.DataFrame:
+        """Build an OHLCV DataFrame straight from raw exchange candle rows."""
+        arr = np.asarray(rows, dtype=np.float64)
+        if arr.ndim != 2 or len(arr) == 0:
+            return pd.DataFrame(np.empty((0, len(self.OHLCV_COLUMNS))), columns=self.OHLCV_COLUMNS)
+        
+        index = pd.to_datetime(arr[:, columns["timestamp"]], unit="s")
+        index.name = "timestamp"
+        # One fancy-index pass yields a single contiguous float64 block; wrap it
+        # without copying so pandas does no dtype inference or consolidation
+        values = arr[:, [columns[col] for col in self.OHLCV_COLUMNS]]
+        return pd.DataFrame(values, index=index, columns=self.OHLCV_COLUMNS, copy=False)
+    
+    def _df_to_klines(self, df: pd.DataFrame) -> List[Dict]:
+        """Convert an OHLCV DataFrame to kline dicts (for response payloads)."""
+        return df.reset_index().to_dict(orient="records")
+    
+    def _ring_write(self, asset: str, df: pd.DataFrame):
+        """Merge freshly fetched 1m candles into the asset's ring buffer."""
+        if df.empty:
+            return
+        
+        ts = df.index.values.astype("datetime64[s]").astype(np.float64)
+        rows = np.column_stack([
+            ts, df[self.OHLCV_COLUMNS].to_numpy(dtype=np.float64)
+        ])[-self.RING_SIZE:]
+        
+        ring = self._ring.get(asset)
+        if ring is None:
+            ring = self._ring[asset] = np.full((self.RING_SIZE, 6), np.nan)
+            self._ring_head[asset] = 0
+            self._ring_count[asset] = 0
+        head = self._ring_head[asset]
+        count = self._ring_count[asset]
+        
+        if count:
+            held = self._ring_view(asset, count)
+            # Re-reported candles (the newest one is usually still forming) are replaced
+            overlap = int((held[:, 0] >= rows[0, 0]).sum())
+            head = (head - overlap) % self.RING_SIZE
+            count -= overlap
+            # A gap since the last held candle breaks contiguity - start over
+            if count and rows[0, 0] - held[count - 1, 0] > self.RING_INTERVAL_SECONDS:
+                count = 0
+        
+        ring[(head + np.arange(len(rows))) % self.RING_SIZE] = rows
+        self._ring_head[asset] = (head + len(rows)) % self.RING_SIZE
+        self._ring_count[asset] = min(count + len(rows), self.RING_SIZE)
+        self._ring_updated[asset] = time.monotonic()
+    
+    def _ring_view(self, asset: str, n: int) -> np.ndarray:
+        """Return the newest n ring rows (oldest first) as an (n, 6) array."""
+        n = min(n, self._ring_count.get(asset, 0))
+        if n == 0:
+            return np.empty((0, 6))
+        head = self._ring_head[asset]
+        return self._ring[asset][(head - n + np.arange(n)) % self.RING_SIZE]
+    
+    def _ring_is_fresh(self, asset: str) -> bool:
+        """Whether the ring holds a full recent window for latest-data stats."""
+        updated = self._ring_updated.get(asset)
+        return (
+            updated is not None
+            and time.monotonic() - updated <= self.RING_MAX_AGE_SECONDS
+            and self._ring_count.get(asset, 0) >= self.LATEST_WINDOW
+        )
+    
+    def _calculate_returns(self, close: np.ndarray, periods: int) -> Optional[float]:
         """Calculate log returns over periods."""
-        if len(df) < periods:
+        if len(close) < periods:
             return None
-        return float(np.log(df["close"].iloc[-1] / df["close"].iloc[-periods]))
+        if NUMBA_AVAILABLE:
+            return float(_returns_nb(close, periods))
+        return float(np.log(close[-1] / close[-periods]))
     
-    def _calculate_volatility(self, df: pd.DataFrame, periods: int) -> Optional[float]:
+    def _calculate_volatility(self, close: np.ndarray, periods: int) -> Optional[float]:
         """Calculate rolling volatility."""
-        if len(df) < periods:
+        if len(close) < periods:
             return None
-        returns = np.log(df["close"] / df["close"].shift(1))
-        return float(returns.tail(periods).std() * np.sqrt(periods))
+        if NUMBA_AVAILABLE:
+            return float(_volatility_nb(close, periods))
+        returns = np.diff(np.log(close))
+        return float(returns[-periods:].std(ddof=1) * np.sqrt(periods))
     
-    def _calculate_cvd(self, df: pd.DataFrame) -> Optional[float]:
+    def _calculate_cvd(
+        self, close: np.ndarray, open_: np.ndarray, volume: np.ndarray
+    ) -> Optional[float]:
         """Calculate Cumulative Volume Delta in USD."""
-        if len(df) < 2:
+        if len(close) < 2:
             return None
-        df = df.copy()
-        df["direction"] = np.where(df["close"] >= df["open"], 1, -1)
+        if NUMBA_AVAILABLE:
+            return float(_cvd_nb(open_, close, volume))
         # Volume delta in USD (volume * price * direction)
-        df["delta_usd"] = df["volume"] * df["close"] * df["direction"]
-        return float(df["delta_usd"].sum())
+        return float(np.where(close >= open_, volume, -volume).dot(close))
@@ -1,26 +1,190 @@
 """
 Model Service - Manages ML models for prediction.
 """
+import asyncio
+import heapq
+import json
+import math
+import mmap
+from dataclasses import dataclass
 from datetime import datetime, timedelta
-from typing import Dict, List, Any, Optional
+from operator import attrgetter, itemgetter
+from typing import Dict, List, Any, Optional, Tuple
 import numpy as np
-import pandas as pd
 from loguru import logger
 import pickle
 from pathlib import Path
 
 from core.config import settings
 
+try:
+    import joblib
+    JOBLIB_AVAILABLE = True
+except ImportError:
+    JOBLIB_AVAILABLE = False
+    logger.warning("joblib not available, loading models with pickle")
+
+try:
+    from numba import njit
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+    logger.warning("numba not available, using pure-Python direction scorer")
+
+
+def _score_direction(returns_1h, volatility, funding, cvd, oi_change):
+    """Combine momentum, CVD, funding and OI signals into p_up in [0.15, 0.85]."""
+    # Initialize score at neutral
+    score = 0.0
+    
+    # 1. MOMENTUM SIGNAL (weight: 40%)
+    # Normalize returns by volatility for comparable signal strength
+    momentum_z = returns_1h / (volatility + 0.001)
+    score += math.tanh(momentum_z * 0.5) * 0.40  # Squash to [-1, 1]
+    
+    # 2. CVD SIGNAL (weight: 25%)
+    # Positive CVD = buying pressure = bullish
+    if cvd != 0:
+        # Normalize CVD - typical range is -10M to +10M USD, $5M as baseline
+        score += math.tanh(cvd / 5_000_000) * 0.25
+    
+    # 3. FUNDING RATE SIGNAL (weight: 20%)
+    # High positive funding = longs paying shorts = contrarian bearish
+    # High negative funding = shorts paying longs = contrarian bullish
+    if funding != 0:
+        # Funding typically ranges from -0.01 to +0.01 (1%)
+        score += -math.tanh(funding * 200) * 0.20  # Contrarian
+    
+    # 4. OI CHANGE SIGNAL (weight: 15%)
+    # Rising OI with momentum = trend continuation
+    # Falling OI = position unwinding
+    if oi_change != 0:
+        # OI change as percentage, typically -5% to +5%
+        oi_signal = math.tanh(oi_change * 10)
+        # Align with momentum direction
+        if returns_1h > 0:
+            score += oi_signal * 0.15
+        else:
+            score += -oi_signal * 0.15
+    
+    # Convert score [-1, 1] to probability [0.15, 0.85]
+    # Allow more extreme predictions but not 0% or 100%
+    p_up = 0.5 + (score * 0.35)
+    
+    return max(0.15, min(0.85, p_up))
+
+
+if NUMBA_AVAILABLE:
+    _score_direction = njit(cache=True, fastmath=True)(_score_direction)
+    
+    @njit(cache=True, fastmath=True)
+    def _cone_bands_nb(current_price, expected_return, adjusted_vol, m):
+        """Rounded mid/+1s/-1s/+2s/-2s prices per minute offset, as a (5, len(m)) array."""
+        bands = np.empty((5, m.shape[0]))
+        for i in range(m.shape[0]):
+            drift = expected_return * (m[i] / 60)
+            vol_band = adjusted_vol * math.sqrt(m[i] / (24 * 60)) * 3
+            bands[0, i] = current_price * math.exp(drift)
+            bands[1, i] = current_price * math.exp(drift + vol_band)
+            bands[2, i] = current_price * math.exp(drift - vol_band)
+            bands[3, i] = current_price * math.exp(drift + 2 * vol_band)
+            bands[4, i] = current_price * math.exp(drift - 2 * vol_band)
+        return np.round(bands, 2)
+
+
+def _f(d: Dict[str, Any], key: str, default: float = 0.0) -> float:
+    """Read a numeric field, treating a missing or None value as `default`."""
+    v = d.get(key)
+    return default if v is None else float(v)
+
+
+@dataclass(slots=True)
+class Signals:
+    """Market signals read once from a market_data dict (missing/None -> default)."""
+    returns_1h: float
+    returns_24h: float
+    volatility_1h: float
+    funding_rate: float
+    open_interest: float
+    cvd: float
+    oi_change_24h: float
+    
+    @classmethod
+    def from_market_data(cls, market_data: Dict[str, Any]) -> "Signals":
+        return cls(
+            returns_1h=_f(market_data, "returns_1h"),
+            returns_24h=_f(market_data, "returns_24h"),
+            # Zero volatility is as unusable as a missing one - keep the truthiness fallback
+            volatility_1h=float(market_data.get("volatility_1h") or 0.02),
+            funding_rate=_f(market_data, "funding_rate"),
+            open_interest=_f(market_data, "open_interest"),
+            cvd=_f(market_data, "cvd"),
+            oi_change_24h=_f(market_data, "oi_change_24h"),
+        )
+
 
 class ModelService:
     """Service for managing and running prediction models."""
     
+    # Model input column order: the model features of Signals, sorted by name
+    FEATURE_ORDER = tuple(sorted((
+        "returns_1h",
+        "returns_24h",
+        "volatility_1h",
+        "funding_rate",
+        "open_interest",
+        "cvd",
+    )))
+    _feature_values = attrgetter(*FEATURE_ORDER)
+    
+    # Feature interpretations for explain(); scale converts the raw value to a
+    # 0-100 contribution score. Direction is `above` if value > threshold.
+    # (feature, display name, scale, threshold, above, at_or_below)
+    CONTRIBUTION_FEATURES = (
+        ("returns_1h", "Momentum (1h)", 1000, 0.0, "bullish", "bearish"),  # 0.01 (1%) becomes 10 contribution
+        ("returns_24h", "Momentum (24h)", 500, 0.0, "bullish", "bearish"),
+        ("funding_rate", "Funding Rate", 50000, 0.0001, "bearish", "bullish"),  # 0.0001 becomes 5 contribution
+        ("cvd", "Volume Delta", 0.00001, 0.0, "bullish", "bearish"),  # $1M becomes 10 contribution
+        ("volatility_1h", "Volatility", 500, 0.0, "neutral", "neutral"),
+    )
+    
+    # Cone width multiplier per regime
+    REGIME_VOL_MULTIPLIERS = {
+        "low-vol": 0.7,
+        "ranging": 1.0,
+        "trend-up": 1.0,
+        "trend-down": 1.0,
+        "high-vol": 1.5,
+        "panic": 2.0,
+    }
+    
+    # Signal-strength multiplier per regime when classifying confidence
+    REGIME_CONFIDENCE_MULTIPLIERS = {
+        "panic": 0.4,       # Very uncertain in panic
+        "high-vol": 0.6,    # Uncertain in high vol
+        "trend-up": 1.2,    # More confident in trends
+        "trend-down": 1.2,
+    }
+    
+    REGIME_EXPLANATIONS = {
+        "trend-up": "Market showing bullish momentum with positive returns and buyer dominance.",
+        "trend-down": "Market showing bearish momentum with negative returns and seller dominance.",
+        "ranging": "Market in consolidation with no clear directional bias.",
+        "high-vol": "Elevated volatility detected. Price swings are larger than normal.",
+        "panic": "Extreme volatility with sharp downward pressure. Risk is elevated.",
+        "low-vol": "Low volatility environment. Smaller moves expected.",
+    }
+    
     def __init__(self):
         self.direction_model = None
         self.magnitude_model = None
         self.volatility_model = None
         self.regime_model = None
         
+        # Input dtype each trained model consumes natively (set in load_models)
+        self._direction_dtype = np.float64
+        self._magnitude_dtype = np.float64
+        
         self.version = settings.model_version
         self.last_trained: Optional[datetime] = None
         self.features_count = 47
@@ -32,6 +196,10 @@ class ModelService:
         self._prediction_tracker = None  # Will be set from app.state
         self._calibration_boost = 1.0  # Multiplier for confidence
         self._direction_bias = 0.0  # Adjustment to p_up based on recent errors
+        
+        # Micro-batching of concurrent predict() calls against trained models
+        self._pending_predictions: List[Tuple[Tuple[str, int, Dict[str, Any]], asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None  # Held so it can't be garbage-collected mid-run
     
     def set_prediction_tracker(self, tracker):
         """Link to prediction tracker for adaptive calibration."""
@@ -111,23 +279,31 @@ class ModelService:
         """Load trained models from disk."""
         models_dir = Path("models/trained")
         
+        # Pay the JIT compile cost of the numba kernels at startup, not on first request
+        _score_direction(0.0, 0.02, 0.0, 0.0, 0.0)
+        self._generate_cone(1.0, 0.0, 0.02, 5, "ranging")
+        
         try:
-            # Try to load existing models
-            if (models_dir / "direction_model.pkl").exists():
-                with open(models_dir / "direction_model.pkl", "rb") as f:
-                    self.direction_model = pickle.load(f)
+            # Try to load existing models - the files are independent, read them concurrently
+            direction_model, magnitude_model, metadata = await asyncio.gather(
+                asyncio.to_thread(self._load_artifact, models_dir / "direction_model.pkl"),
+                asyncio.to_thread(self._load_artifact, models_dir / "magnitude_model.pkl"),
+                asyncio.to_thread(self._load_metadata, models_dir),
+            )
+            
+            if direction_model is not None:
+                self.direction_model = direction_model
+                self._direction_dtype = self._preferred_input_dtype(direction_model)
                 logger.info("Loaded direction model")
             
-            if (models_dir / "magnitude_model.pkl").exists():
-                with open(models_dir / "magnitude_model.pkl", "rb") as f:
-                    self.magnitude_model = pickle.load(f)
+            if magnitude_model is not None:
+                self.magnitude_model = magnitude_model
+                self._magnitude_dtype = self._preferred_input_dtype(magnitude_model)
                 logger.info("Loaded magnitude model")
             
-            if (models_dir / "metadata.pkl").exists():
-                with open(models_dir / "metadata.pkl", "rb") as f:
-                    metadata = pickle.load(f)
-                    self.last_trained = metadata.get("last_trained")
-                    self.validation_metrics = metadata.get("validation_metrics", {})
+            if metadata is not None:
+                self.last_trained = metadata.get("last_trained")
+                self.validation_metrics = metadata.get("validation_metrics", {})
             
             self._models_loaded = True
             
@@ -135,6 +311,50 @@ class ModelService:
             logger.warning(f"Could not load models: {e}. Using fallback.")
             self._models_loaded = False
     
+    @staticmethod
+    def _load_artifact(path: Path) -> Any:
+        """Load a pickled model file, memory-mapping its arrays when joblib is available."""
+        if not path.exists():
+            return None
+        
+        if JOBLIB_AVAILABLE:
+            return joblib.load(path, mmap_mode="r")
+        
+        # Map the whole file with readahead (MAP_POPULATE on Linux) and unpickle from the mapping
+        with open(path, "rb") as f:
+            flags = mmap.MAP_SHARED | getattr(mmap, "MAP_POPULATE", 0)
+            with mmap.mmap(f.fileno(), 0, flags=flags, prot=mmap.PROT_READ) as mm:
+                return pickle.loads(mm)
+    
+    @staticmethod
+    def _preferred_input_dtype(model: Any) -> type:
+        """
+        float32 for scikit-learn tree models, which cast every input to float32
+        before traversal anyway; float64 otherwise (e.g. LightGBM keeps double
+        thresholds, so quantizing inputs could flip splits).
+        """
+        estimators = getattr(model, "estimators_", None)
+        first = np.ravel(estimators)[0] if estimators is not None and len(estimators) else model
+        return np.float32 if hasattr(first, "tree_") else np.float64
+    
+    @staticmethod
+    def _load_metadata(models_dir: Path) -> Optional[Dict[str, Any]]:
+        """Load training metadata (JSON, falling back to the legacy pickle)."""
+        json_path = models_dir / "metadata.json"
+        if json_path.exists():
+            with open(json_path, "r") as f:
+                metadata = json.load(f)
+            if metadata.get("last_trained"):
+                metadata["last_trained"] = datetime.fromisoformat(metadata["last_trained"])
+            return metadata
+        
+        pkl_path = models_dir / "metadata.pkl"
+        if pkl_path.exists():
+            with open(pkl_path, "rb") as f:
+                return pickle.load(f)
+        
+        return None
+    
     async def predict(
         self,
         asset: str,
@@ -142,23 +362,135 @@ class ModelService:
         market_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Generate prediction for an asset."""
+        item = (asset, horizon_minutes, market_data)
+        
+        if not (self._models_loaded and self.direction_model):
+            # Fallback scoring has no per-call model overhead to amortize
+            predictions = await self.predict_batch([item])
+            return predictions[0]
+        
+        # Coalesce concurrent calls into one model call. An idle model is flushed on the
+        # next loop iteration (no fixed wait); calls arriving while a batch is running
+        # queue up and go out together as soon as it finishes.
+        future = asyncio.get_running_loop().create_future()
+        self._pending_predictions.append((item, future))
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_predictions())
+        return await future
+    
+    async def _flush_predictions(self):
+        """Run queued predict() calls in batches until the queue is empty."""
+        try:
+            while self._pending_predictions:
+                pending, self._pending_predictions = self._pending_predictions, []
+                await self._resolve_predictions(pending)
+        finally:
+            self._flush_task = None
+    
+    async def _resolve_predictions(
+        self,
+        pending: List[Tuple[Tuple[str, int, Dict[str, Any]], asyncio.Future]]
+    ):
+        """Predict one coalesced batch and resolve each caller's future."""
+        items = [item for item, _ in pending]
+        try:
+            results = await self.predict_batch(items)
+        except Exception as e:
+            if len(pending) == 1:
+                results = [e]
+            else:
+                # Don't fail every coalesced caller for one bad item - retry them one by one
+                singles = await asyncio.gather(
+                    *(self.predict_batch([item]) for item in items), return_exceptions=True
+                )
+                results = [r if isinstance(r, BaseException) else r[0] for r in singles]
+        
+        for (_, future), result in zip(pending, results):
+            if future.done():
+                continue
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+    
+    async def predict_batch(
+        self,
+        items: List[Tuple[str, int, Dict[str, Any]]]
+    ) -> List[Dict[str, Any]]:
+        """
+        Generate predictions for several (asset, horizon_minutes, market_data) items.
+        
+        Trained models are invoked once for the whole batch, so their per-call
+        input validation overhead is shared across assets.
+        """
+        if not items:
+            return []
+        
         timestamp = datetime.utcnow()
         
-        # Extract features from market data
-        features = self._extract_features(market_data)
+        # Adaptive calibration reads the tracker's live history - keep it on the event loop
+        calibration = self._get_calibration_adjustment()
+        
+        if self._models_loaded and self.direction_model:
+            # Trained-model inference is real CPU work - run it off the event loop
+            return await asyncio.to_thread(self._predict_batch_sync, items, timestamp, calibration)
+        
+        # The fallback scorer is cheaper than a thread hop
+        return self._predict_batch_sync(items, timestamp, calibration)
+    
+    def _predict_batch_sync(
+        self,
+        items: List[Tuple[str, int, Dict[str, Any]]],
+        timestamp: datetime,
+        calibration: Tuple[float, float]
+    ) -> List[Dict[str, Any]]:
+        """Synchronous body of predict_batch()."""
+        # Extract signals from market data
+        signals = [Signals.from_market_data(md) for _, _, md in items]
+        
+        # Horizon-scaled volatility, shared by the fallback magnitude and the response
+        volatilities = [
+            self._estimate_volatility(sig, horizon) for (_, horizon, _), sig in zip(items, signals)
+        ]
         
         # Get predictions
         if self._models_loaded and self.direction_model:
-            p_up = self._predict_direction(features)
-            expected_move = self._predict_magnitude(features)
+            X = self._feature_matrix(signals)
+            p_ups = self._predict_direction(X).tolist()
+            expected_moves = self._predict_magnitude(X).tolist()
         else:
             # Fallback: simple momentum-based prediction
-            p_up = self._fallback_direction(market_data)
-            expected_move = self._fallback_magnitude(market_data, horizon_minutes)
+            p_ups = [self._fallback_direction(sig) for sig in signals]
+            expected_moves = [
+                self._fallback_magnitude(sig, vol) for sig, vol in zip(signals, volatilities)
+            ]
         
         # Apply adaptive calibration based on recent performance
-        confidence_boost, direction_bias = self._get_calibration_adjustment()
-        
+        confidence_boost, direction_bias = calibration
+        
+        return [
+            self._assemble_prediction(
+                asset, horizon_minutes, market_data["price"], sig, timestamp,
+                p_up, expected_move, volatility, confidence_boost, direction_bias
+            )
+            for (asset, horizon_minutes, market_data), sig, p_up, expected_move, volatility
+            in zip(items, signals, p_ups, expected_moves, volatilities)
+        ]
+    
+    def _assemble_prediction(
+        self,
+        asset: str,
+        horizon_minutes: int,
+        current_price: float,
+        signals: Signals,
+        timestamp: datetime,
+        p_up: float,
+        expected_move: float,
+        volatility: float,
+        confidence_boost: float,
+        direction_bias: float
+    ) -> Dict[str, Any]:
+        """Calibrate a raw model output and build the prediction response."""
         # Adjust p_up with direction bias (learned from recent accuracy)
         p_up = max(0.15, min(0.85, p_up + direction_bias))
         
@@ -173,17 +505,13 @@ class ModelService:
         
         p_down = 1.0 - p_up
         
-        # Estimate volatility
-        volatility = self._estimate_volatility(market_data, horizon_minutes)
-        
         # Detect regime
-        regime = self._detect_regime(market_data, p_up, volatility)
+        regime = self._detect_regime(signals, p_up, volatility)
         
         # Calculate confidence
         confidence = self._calculate_confidence(p_up, volatility, regime)
         
         # Generate prediction cone
-        current_price = market_data["price"]
         cone = self._generate_cone(
             current_price=current_price,
             expected_return=expected_move,
@@ -212,31 +540,31 @@ class ModelService:
         market_data: Dict[str, Any]
     ) -> Dict[str, Any]:
         """Explain a prediction."""
-        features = self._extract_features(market_data)
+        signals = Signals.from_market_data(market_data)
         
         # Calculate feature contributions
-        contributions = self._calculate_contributions(features)
+        contributions = self._calculate_contributions(signals)
         
         # Separate bullish and bearish factors
         bullish = [c for c in contributions if c["direction"] == "bullish"]
         bearish = [c for c in contributions if c["direction"] == "bearish"]
         
-        bullish.sort(key=lambda x: abs(x["contribution"]), reverse=True)
-        bearish.sort(key=lambda x: abs(x["contribution"]), reverse=True)
+        # Contributions are non-negative by construction - rank on the raw value
+        by_contribution = itemgetter("contribution")
+        top_bullish = heapq.nlargest(5, bullish, key=by_contribution)
+        top_bearish = heapq.nlargest(5, bearish, key=by_contribution)
+        
+        # Direction score, shared by the regime and the summary
+        p_up = self._fallback_direction(signals)
         
         # Regime explanation
-        regime = self._detect_regime(
-            market_data, 
-            self._fallback_direction(market_data),
-            self._estimate_volatility(market_data, 4)
-        )
+        regime = self._detect_regime(signals, p_up, self._estimate_volatility(signals, 4))
         regime_explanation = self._explain_regime(regime, market_data)
         
         # Confidence factors
-        confidence_factors = self._get_confidence_factors(market_data)
+        confidence_factors = self._get_confidence_factors(signals)
         
         # Generate summary
-        p_up = self._fallback_direction(market_data)
         if p_up > 0.55:
             direction = "bullish"
         elif p_up < 0.45:
@@ -250,8 +578,8 @@ class ModelService:
             "asset": asset,
             "timestamp": timestamp,
             "prediction_summary": summary,
-            "top_bullish_factors": bullish[:5],
-            "top_bearish_factors": bearish[:5],
+            "top_bullish_factors": top_bullish,
+            "top_bearish_factors": top_bearish,
             "regime_explanation": regime_explanation,
             "confidence_factors": confidence_factors,
         }
@@ -266,77 +594,105 @@ class ModelService:
         position_size_pct: float
     ) -> Dict[str, Any]:
         """Run backtest simulation."""
+        # Pure NumPy work with a call-local RNG - safe to run in a worker thread
+        return await asyncio.to_thread(
+            self._backtest_sync,
+            asset, start_date, end_date, strategy, initial_capital, position_size_pct
+        )
+    
+    def _backtest_sync(
+        self,
+        asset: str,
+        start_date: datetime,
+        end_date: datetime,
+        strategy: str,
+        initial_capital: float,
+        position_size_pct: float
+    ) -> Dict[str, Any]:
+        """Synthetic backtest body, run off the event loop by backtest()."""
         # For demo, generate synthetic results
         # In production, this would load historical data and simulate
         
         days = (end_date - start_date).days
         
         # Generate synthetic equity curve
-        np.random.seed(42)
-        daily_returns = np.random.normal(0.002, 0.02, days)
+        rng = np.random.default_rng(42)
+        daily_returns = rng.normal(0.002, 0.02, days)
         equity = initial_capital * np.cumprod(1 + daily_returns)
         
         # Calculate metrics
         total_return = (equity[-1] - initial_capital) / initial_capital
         annualized_return = (1 + total_return) ** (365 / days) - 1
-        sharpe = np.mean(daily_returns) / np.std(daily_returns) * np.sqrt(365)
+        sharpe = np.mean(daily_returns) / np.std(daily_returns) * math.sqrt(365)
         
         # Calculate drawdown
         peak = np.maximum.accumulate(equity)
         drawdown = (peak - equity) / peak
         max_drawdown = drawdown.max()
         
-        # Generate trades
-        num_trades = int(days * 0.3)  # ~30% of days have trades
-        trades = []
-        
-        for i in range(num_trades):
-            entry_idx = np.random.randint(0, days - 1)
-            exit_idx = entry_idx + np.random.randint(1, min(5, days - entry_idx))
-            
-            entry_time = start_date + timedelta(days=int(entry_idx))
-            exit_time = start_date + timedelta(days=int(exit_idx))
-            
-            direction = "long" if np.random.random() > 0.5 else "short"
-            entry_price = 40000 + np.random.normal(0, 2000)
-            pnl_pct = np.random.normal(0.005, 0.02)
-            exit_price = entry_price * (1 + pnl_pct if direction == "long" else 1 - pnl_pct)
-            
-            trades.append({
-                "entry_time": entry_time,
-                "exit_time": exit_time,
-                "direction": direction,
-                "entry_price": round(entry_price, 2),
-                "exit_price": round(exit_price, 2),
-                "pnl": round(entry_price * pnl_pct * position_size_pct, 2),
-                "pnl_pct": round(pnl_pct, 4),
-            })
+        # Generate trades (~30% of days have trades), sampled as whole arrays
+        num_trades = int(days * 0.3)
+        entry_idx = rng.integers(0, max(days - 1, 1), num_trades)
+        exit_idx = entry_idx + rng.integers(1, np.minimum(5, days - entry_idx))
+        is_long = rng.random(num_trades) > 0.5
+        entry_prices = 40000 + rng.normal(0, 2000, num_trades)
+        pnl_pcts = rng.normal(0.005, 0.02, num_trades)
+        exit_prices = entry_prices * np.where(is_long, 1 + pnl_pcts, 1 - pnl_pcts)
+        pnls = np.round(entry_prices * pnl_pcts * position_size_pct, 2)
         
         # Win rate
-        winning_trades = sum(1 for t in trades if t["pnl"] > 0)
-        win_rate = winning_trades / len(trades) if trades else 0
+        wins = pnls > 0
+        win_rate = float(wins.mean()) if num_trades else 0
         
-        # Profit factor
-        gross_profit = sum(t["pnl"] for t in trades if t["pnl"] > 0)
-        gross_loss = abs(sum(t["pnl"] for t in trades if t["pnl"] < 0))
+        # Profit factor (zero-PnL trades add nothing to either side)
+        gross_profit = pnls[wins].sum()
+        gross_loss = -pnls[~wins].sum()
         profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
         
+        # Only the trades returned in the response are materialized as dicts
+        shown = slice(0, 20)
+        trades = [
+            {
+                "entry_time": start_date + timedelta(days=entry),
+                "exit_time": start_date + timedelta(days=exit_),
+                "direction": "long" if long_ else "short",
+                "entry_price": entry_price,
+                "exit_price": exit_price,
+                "pnl": pnl,
+                "pnl_pct": pnl_pct,
+            }
+            for entry, exit_, long_, entry_price, exit_price, pnl, pnl_pct in zip(
+                entry_idx[shown].tolist(),
+                exit_idx[shown].tolist(),
+                is_long[shown].tolist(),
+                np.round(entry_prices[shown], 2).tolist(),
+                np.round(exit_prices[shown], 2).tolist(),
+                pnls[shown].tolist(),
+                np.round(pnl_pcts[shown], 4).tolist(),
+            )
+        ]
+        
         # Buy and hold
-        buy_hold_return = np.random.uniform(0.1, 0.3) if days > 30 else np.random.uniform(-0.1, 0.1)
+        buy_hold_return = rng.uniform(0.1, 0.3) if days > 30 else rng.uniform(-0.1, 0.1)
         
         # Equity curve (sampled)
-        equity_curve = []
         sample_indices = np.linspace(0, len(equity) - 1, min(100, len(equity)), dtype=int)
-        for idx in sample_indices:
-            equity_curve.append({
-                "date": (start_date + timedelta(days=int(idx))).isoformat(),
-                "equity": round(equity[idx], 2),
-                "drawdown": round(drawdown[idx], 4),
-            })
+        equity_curve = [
+            {
+                "date": (start_date + timedelta(days=idx)).isoformat(),
+                "equity": eq,
+                "drawdown": dd,
+            }
+            for idx, eq, dd in zip(
+                sample_indices.tolist(),
+                np.round(equity[sample_indices], 2).tolist(),
+                np.round(drawdown[sample_indices], 4).tolist(),
+            )
+        ]
         
         # Sortino ratio
         downside_returns = daily_returns[daily_returns < 0]
-        sortino = np.mean(daily_returns) / np.std(downside_returns) * np.sqrt(365) if len(downside_returns) > 0 else 0
+        sortino = np.mean(daily_returns) / np.std(downside_returns) * math.sqrt(365) if len(downside_returns) > 0 else 0
         
         return {
             "asset": asset,
@@ -350,10 +706,10 @@ class ModelService:
             "max_drawdown": round(max_drawdown, 4),
             "win_rate": round(win_rate, 4),
             "profit_factor": round(profit_factor, 2),
-            "total_trades": len(trades),
+            "total_trades": num_trades,
             "buy_hold_return": round(buy_hold_return, 4),
             "alpha": round(total_return - buy_hold_return, 4),
-            "trades": trades[:20],  # Limit to 20 trades in response
+            "trades": trades,  # Limited to 20 trades in response
             "equity_curve": equity_curve,
         }
     
@@ -361,43 +717,30 @@ class ModelService:
     # Private Methods
     # ========================================================================
     
-    def _extract_features(self, market_data: Dict[str, Any]) -> Dict[str, float]:
-        """Extract ML features from market data."""
-        features = {}
-        
-        # Price features
-        features["returns_1h"] = market_data.get("returns_1h", 0) or 0
-        features["returns_24h"] = market_data.get("returns_24h", 0) or 0
-        features["volatility_1h"] = market_data.get("volatility_1h", 0.02) or 0.02
-        
-        # Derivatives features
-        features["funding_rate"] = market_data.get("funding_rate", 0) or 0
-        features["open_interest"] = market_data.get("open_interest", 0) or 0
-        
-        # Microstructure
-        features["cvd"] = market_data.get("cvd", 0) or 0
-        
-        return features
+    def _feature_matrix(self, rows: List[Signals]) -> np.ndarray:
+        """Lay out signals as a (len(rows), n) model input matrix in FEATURE_ORDER."""
+        n = len(self.FEATURE_ORDER)
+        return np.fromiter(
+            (value for sig in rows for value in self._feature_values(sig)),
+            dtype=np.float64,
+            count=len(rows) * n,
+        ).reshape(len(rows), n)
     
-    def _predict_direction(self, features: Dict[str, float]) -> float:
-        """Predict direction using trained model."""
+    def _predict_direction(self, X: np.ndarray) -> np.ndarray:
+        """Predict P(up) for each row of X using trained model."""
         if self.direction_model is None:
-            return 0.5
+            return np.full(X.shape[0], 0.5)
         
-        X = np.array([[features.get(f, 0) for f in sorted(features.keys())]])
-        prob = self.direction_model.predict_proba(X)[0][1]
-        return float(prob)
+        return self.direction_model.predict_proba(X.astype(self._direction_dtype, copy=False))[:, 1]
     
-    def _predict_magnitude(self, features: Dict[str, float]) -> float:
-        """Predict magnitude using trained model."""
+    def _predict_magnitude(self, X: np.ndarray) -> np.ndarray:
+        """Predict magnitude for each row of X using trained model."""
         if self.magnitude_model is None:
-            return 0.0
+            return np.zeros(X.shape[0])
         
-        X = np.array([[features.get(f, 0) for f in sorted(features.keys())]])
-        magnitude = self.magnitude_model.predict(X)[0]
-        return float(magnitude)
+        return self.magnitude_model.predict(X.astype(self._magnitude_dtype, copy=False))
     
-    def _fallback_direction(self, market_data: Dict[str, Any]) -> float:
+    def _fallback_direction(self, signals: Signals) -> float:
         """
         Multi-signal direction prediction using:
         - Price momentum (strongest signal)
@@ -405,63 +748,21 @@ class ModelService:
         - Funding rate (contrarian)
         - Open Interest changes
         """
-        # Get all available signals
-        returns_1h = market_data.get("returns_1h", 0) or 0
-        volatility = market_data.get("volatility_1h", 0.02) or 0.02
-        funding = market_data.get("funding_rate", 0) or 0
-        cvd = market_data.get("cvd", 0) or 0
-        oi_change = market_data.get("oi_change_24h", 0) or 0
-        
-        # Initialize score at neutral
-        score = 0.0
-        
-        # 1. MOMENTUM SIGNAL (weight: 40%)
-        # Normalize returns by volatility for comparable signal strength
-        momentum_z = returns_1h / (volatility + 0.001)
-        momentum_signal = np.tanh(momentum_z * 0.5)  # Squash to [-1, 1]
-        score += momentum_signal * 0.40
-        
-        # 2. CVD SIGNAL (weight: 25%)
-        # Positive CVD = buying pressure = bullish
-        if cvd != 0:
-            # Normalize CVD - typical range is -10M to +10M USD
-            cvd_normalized = cvd / 5_000_000  # $5M as baseline
-            cvd_signal = np.tanh(cvd_normalized)
-            score += cvd_signal * 0.25
-        
-        # 3. FUNDING RATE SIGNAL (weight: 20%)
-        # High positive funding = longs paying shorts = contrarian bearish
-        # High negative funding = shorts paying longs = contrarian bullish
-        if funding != 0:
-            # Funding typically ranges from -0.01 to +0.01 (1%)
-            funding_signal = -np.tanh(funding * 200)  # Contrarian
-            score += funding_signal * 0.20
-        
-        # 4. OI CHANGE SIGNAL (weight: 15%)
-        # Rising OI with momentum = trend continuation
-        # Falling OI = position unwinding
-        if oi_change != 0:
-            # OI change as percentage, typically -5% to +5%
-            oi_signal = np.tanh(oi_change * 10)
-            # Align with momentum direction
-            if returns_1h > 0:
-                score += oi_signal * 0.15
-            else:
-                score += -oi_signal * 0.15
-        
-        # Convert score [-1, 1] to probability [0.15, 0.85]
-        # Allow more extreme predictions but not 0% or 100%
-        p_up = 0.5 + (score * 0.35)
-        
-        return max(0.15, min(0.85, p_up))
+        return _score_direction(
+            signals.returns_1h,
+            signals.volatility_1h,
+            signals.funding_rate,
+            signals.cvd,
+            signals.oi_change_24h,
+        )
     
-    def _fallback_magnitude(self, market_data: Dict[str, Any], horizon_minutes: int = 5) -> float:
-        """Simple magnitude prediction scaled for minute horizons."""
-        volatility = market_data.get("volatility_1h", 0.02) or 0.02
-        returns_1h = market_data.get("returns_1h", 0) or 0
+    def _fallback_magnitude(self, signals: Signals, minute_vol: float) -> float:
+        """
+        Simple magnitude prediction scaled for minute horizons.
         
-        # Scale volatility for minute horizon (sqrt of time)
-        minute_vol = volatility * np.sqrt(horizon_minutes / 60)
+        `minute_vol` is the horizon-scaled volatility from _estimate_volatility.
+        """
+        returns_1h = signals.returns_1h
         
         # Expected move is fraction of volatility in direction of momentum
         direction = 1 if returns_1h > 0 else -1
@@ -469,27 +770,25 @@ class ModelService:
     
     def _estimate_volatility(
         self, 
-        market_data: Dict[str, Any], 
+        signals: Signals, 
         horizon_minutes: int
     ) -> float:
         """Estimate volatility for minute horizon."""
-        base_vol = market_data.get("volatility_1h", 0.02) or 0.02
+        base_vol = signals.volatility_1h
         
         # Scale by square root of time (convert minutes to hours)
-        horizon_vol = base_vol * np.sqrt(horizon_minutes / 60)
+        horizon_vol = base_vol * math.sqrt(horizon_minutes / 60)
         
         return horizon_vol
     
     def _detect_regime(
         self, 
-        market_data: Dict[str, Any], 
+        signals: Signals, 
         p_up: float,
         volatility: float
     ) -> str:
         """Detect market regime based on multiple factors."""
-        returns_1h = market_data.get("returns_1h", 0) or 0
-        funding = market_data.get("funding_rate", 0) or 0
-        cvd = market_data.get("cvd", 0) or 0
+        returns_1h = signals.returns_1h
         
         # Panic: Sharp drop with high volatility
         if returns_1h < -0.02 and volatility > 0.03:
@@ -525,12 +824,7 @@ class ModelService:
         prob_strength = abs(p_up - 0.5) * 2  # 0 to 1 scale
         
         # Adjust for regime
-        if regime == "panic":
-            prob_strength *= 0.4  # Very uncertain in panic
-        elif regime == "high-vol":
-            prob_strength *= 0.6  # Uncertain in high vol
-        elif regime in ["trend-up", "trend-down"]:
-            prob_strength *= 1.2  # More confident in trends
+        prob_strength *= self.REGIME_CONFIDENCE_MULTIPLIERS.get(regime, 1.0)
         
         # Classify confidence
         if prob_strength > 0.25:
@@ -550,116 +844,81 @@ class ModelService:
     ) -> List[Dict]:
         """Generate prediction cone for minute horizons."""
         # Regime adjustments
-        vol_multiplier = {
-            "low-vol": 0.7,
-            "ranging": 1.0,
-            "trend-up": 1.0,
-            "trend-down": 1.0,
-            "high-vol": 1.5,
-            "panic": 2.0,
-        }.get(regime, 1.0)
+        vol_multiplier = self.REGIME_VOL_MULTIPLIERS.get(regime, 1.0)
         
         adjusted_vol = volatility * vol_multiplier
         
         # Generate minute steps (up to horizon)
-        cone = []
         steps = min(horizon_minutes + 1, 11)  # Cap at 11 points (0 to 10)
         step_size = horizon_minutes / (steps - 1) if steps > 1 else 1
+        m = np.arange(steps, dtype=np.float64) * step_size
         
-        for i in range(steps):
-            m = i * step_size
-            t = m / (24 * 60)  # Convert minutes to fraction of day
-            sqrt_t = np.sqrt(t) if t > 0 else 0
+        # Rows: mid, upper_1sigma, lower_1sigma, upper_2sigma, lower_2sigma
+        if NUMBA_AVAILABLE:
+            bands = _cone_bands_nb(float(current_price), float(expected_return), float(adjusted_vol), m).tolist()
+        else:
+            sqrt_t = np.sqrt(m / (24 * 60))  # Convert minutes to fraction of day
             
             # Expected price at time t
             drift = expected_return * (m / 60)  # Scale drift for minutes
-            mid_price = current_price * np.exp(drift)
             
             # Volatility bands
             vol_band = adjusted_vol * sqrt_t * 3  # Scale for visualization
             
-            timestamp = datetime.utcnow() + timedelta(minutes=m)
-            
-            cone.append({
+            bands = np.round(
+                current_price * np.exp(
+                    np.stack([drift, drift + vol_band, drift - vol_band, drift + 2 * vol_band, drift - 2 * vol_band])
+                ),
+                2,
+            ).tolist()
+        
+        # Offsets in whole microseconds on a datetime64 base; tolist() yields datetimes
+        timestamps = (
+            np.datetime64(datetime.utcnow(), "us") + (m * 60e6).astype("timedelta64[us]")
+        ).tolist()
+        
+        return [
+            {
                 "timestamp": timestamp,
-                "mid": round(mid_price, 2),
-                "upper_1sigma": round(current_price * np.exp(drift + vol_band), 2),
-                "lower_1sigma": round(current_price * np.exp(drift - vol_band), 2),
-                "upper_2sigma": round(current_price * np.exp(drift + 2 * vol_band), 2),
-                "lower_2sigma": round(current_price * np.exp(drift - 2 * vol_band), 2),
-            })
-        
-        return cone
+                "mid": mid,
+                "upper_1sigma": upper_1,
+                "lower_1sigma": lower_1,
+                "upper_2sigma": upper_2,
+                "lower_2sigma": lower_2,
+            }
+            for timestamp, mid, upper_1, lower_1, upper_2, lower_2 in zip(timestamps, *bands)
+        ]
     
     def _calculate_contributions(
         self, 
-        features: Dict[str, float]
+        signals: Signals
     ) -> List[Dict]:
         """Calculate feature contributions to prediction."""
         contributions = []
         
-        # Define feature interpretations with proper scaling
-        # contribution_scale converts raw value to a 0-100 contribution score
-        feature_config = {
-            "returns_1h": {
-                "name": "Momentum (1h)",
-                "direction": "bullish" if features.get("returns_1h", 0) > 0 else "bearish",
-                "scale": 1000,  # 0.01 (1%) becomes 10 contribution
-            },
-            "returns_24h": {
-                "name": "Momentum (24h)",
-                "direction": "bullish" if features.get("returns_24h", 0) > 0 else "bearish",
-                "scale": 500,
-            },
-            "funding_rate": {
-                "name": "Funding Rate",
-                "direction": "bearish" if features.get("funding_rate", 0) > 0.0001 else "bullish",
-                "scale": 50000,  # 0.0001 becomes 5 contribution
-            },
-            "cvd": {
-                "name": "Volume Delta",
-                "direction": "bullish" if features.get("cvd", 0) > 0 else "bearish",
-                "scale": 0.00001,  # $1M becomes 10 contribution
-            },
-            "volatility_1h": {
-                "name": "Volatility",
-                "direction": "neutral",
-                "scale": 500,
-            },
-        }
-        
-        for feature, value in features.items():
-            if feature in feature_config:
-                config = feature_config[feature]
-                # Scale contribution to reasonable 0-100 range
-                contribution = min(abs(value) * config["scale"], 50)  # Cap at 50
-                contributions.append({
-                    "feature": config["name"],
-                    "value": round(value, 6) if abs(value) < 1000 else round(value / 1e6, 2),
-                    "contribution": round(contribution, 1),
-                    "direction": config["direction"],
-                })
+        for feature, name, scale, threshold, above, at_or_below in self.CONTRIBUTION_FEATURES:
+            value = getattr(signals, feature)
+            # Scale contribution to reasonable 0-100 range
+            contribution = min(abs(value) * scale, 50)  # Cap at 50
+            contributions.append({
+                "feature": name,
+                "value": round(value, 6) if abs(value) < 1000 else round(value / 1e6, 2),
+                "contribution": round(contribution, 1),
+                "direction": above if value > threshold else at_or_below,
+            })
         
         return contributions
     
     def _explain_regime(self, regime: str, market_data: Dict[str, Any]) -> str:
         """Generate regime explanation."""
-        explanations = {
-            "trend-up": "Market showing bullish momentum with positive returns and buyer dominance.",
-            "trend-down": "Market showing bearish momentum with negative returns and seller dominance.",
-            "ranging": "Market in consolidation with no clear directional bias.",
-            "high-vol": "Elevated volatility detected. Price swings are larger than normal.",
-            "panic": "Extreme volatility with sharp downward pressure. Risk is elevated.",
-            "low-vol": "Low volatility environment. Smaller moves expected.",
-        }
-        return explanations.get(regime, "Unknown regime.")
+        return self.REGIME_EXPLANATIONS.get(regime, "Unknown regime.")
     
-    def _get_confidence_factors(self, market_data: Dict[str, Any]) -> List[str]:
+    def _get_confidence_factors(self, signals: Signals) -> List[str]:
         """Get factors affecting prediction confidence."""
         factors = []
         
-        volatility = market_data.get("volatility_1h", 0.02) or 0.02
-        funding = market_data.get("funding_rate", 0) or 0
+        volatility = signals.volatility_1h
+        funding = signals.funding_rate
         
         if volatility > 0.04:
             factors.append("High volatility reduces confidence")
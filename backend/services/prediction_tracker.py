@@ -2,16 +2,46 @@
 Prediction Tracker - Logs predictions and validates them after horizon expires.
 """
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
-from collections import deque
-import json
+import heapq
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Any, Tuple
+from dataclasses import dataclass, asdict, field
+from collections import defaultdict, deque
+from operator import attrgetter
+import os
+import threading
 from pathlib import Path
 from loguru import logger
 
+try:
+    from orjson import dumps as json_dumps, loads as json_loads
+except ImportError:
+    import json
+    from json import loads as json_loads
+    logger.warning("orjson not available, using stdlib json for prediction history")
 
-@dataclass
+    def json_dumps(obj) -> bytes:
+        return json.dumps(obj).encode()
+
+
+def _to_utc_iso(dt: Optional[datetime]) -> Optional[str]:
+    """Add 'Z' suffix to indicate UTC timestamps for proper browser timezone conversion."""
+    if dt is None:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt.isoformat() + 'Z'
+
+
+def _parse_utc_iso(value: str) -> datetime:
+    """Parse a _to_utc_iso string (including older '+00:00Z' ones) to naive UTC like utcnow()."""
+    dt = datetime.fromisoformat(value[:-1] if value.endswith('Z') else value)
+    if dt.tzinfo is not None:
+        dt = dt.astimezone(timezone.utc).replace(tzinfo=None)
+    return dt
+
+
+@dataclass(slots=True)
 class PredictionRecord:
     """A single prediction record."""
     id: str
@@ -33,17 +63,25 @@ class PredictionRecord:
     prediction_correct: Optional[bool] = None
     validated_at: Optional[datetime] = None
     
+    # ISO strings are formatted once, when the timestamps are set
+    timestamp_iso: str = field(init=False, repr=False, compare=False)
+    validated_at_iso: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    
+    # Validated records never change again, so their dict form is built once
+    _cached_dict: Optional[dict] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self.timestamp_iso = _to_utc_iso(self.timestamp)
+        self.validated_at_iso = _to_utc_iso(self.validated_at)
+    
     def to_dict(self) -> dict:
-        # Add 'Z' suffix to indicate UTC timestamps for proper browser timezone conversion
-        def to_utc_iso(dt):
-            if dt is None:
-                return None
-            return dt.isoformat() + 'Z' if not dt.isoformat().endswith('Z') else dt.isoformat()
+        if self._cached_dict is not None:
+            return self._cached_dict
         
-        return {
+        d = {
             'id': self.id,
             'asset': self.asset,
-            'timestamp': to_utc_iso(self.timestamp),
+            'timestamp': self.timestamp_iso,
             'horizon_minutes': int(self.horizon_minutes),
             'entry_price': float(self.entry_price),
             'p_up': float(self.p_up),
@@ -54,8 +92,11 @@ class PredictionRecord:
             'exit_price': float(self.exit_price) if self.exit_price is not None else None,
             'actual_move': float(self.actual_move) if self.actual_move is not None else None,
             'prediction_correct': bool(self.prediction_correct) if self.prediction_correct is not None else None,
-            'validated_at': to_utc_iso(self.validated_at),
+            'validated_at': self.validated_at_iso,
         }
+        if self.validated_at is not None:
+            self._cached_dict = d
+        return d
 
 
 class PredictionTracker:
@@ -66,13 +107,26 @@ class PredictionTracker:
     
     MAX_HISTORY = 500  # Keep last 500 predictions
     HISTORY_FILE = Path("data/prediction_history.json")
+    JOURNAL_FILE = Path("data/prediction_history.jsonl")  # Validations since last snapshot
+    COMPACT_EVERY = 100  # Fold the journal into the snapshot every N validations
+    MAX_LOAD_BYTES = 5 * 1024 * 1024  # Startup load is synchronous - don't parse oversized files
     
     def __init__(self, data_service=None):
         self.data_service = data_service
         self.predictions: deque = deque(maxlen=self.MAX_HISTORY)
+        # Same records split per asset, kept in step with self.predictions
+        self._by_asset: Dict[str, deque] = defaultdict(deque)
         self.pending_validations: Dict[str, PredictionRecord] = {}
+        # Min-heap of (expiry, prediction id) for pending predictions
+        self._expiry_heap: List[Tuple[datetime, str]] = []
         self._running = False
         self._counter = 0
+        # Per-process id prefix; the startup time keeps ids unique across restarts
+        self._id_prefix = datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        self._journal_fp = None
+        self._journal_lock = threading.Lock()  # Serializes journal I/O between the writer thread and close()
+        self._journal_writes = 0
+        self._unsaved: List[bytes] = []  # Journal lines not yet flushed to disk
         
         # Stats
         self.total_predictions = 0
@@ -83,7 +137,7 @@ class PredictionTracker:
             'low': {'total': 0, 'correct': 0},
         }
         
-        # Load history from disk
+        # Load history from disk (no running loop yet, so this stays synchronous)
         self._load_history()
     
     def log_prediction(
@@ -99,7 +153,7 @@ class PredictionTracker:
         """Log a new prediction."""
         self._counter += 1
         record = PredictionRecord(
-            id=f"{asset}_{datetime.utcnow().strftime('%H%M%S')}_{self._counter}",
+            id=f"{asset}_{self._id_prefix}_{self._counter}",
             asset=asset,
             timestamp=datetime.utcnow(),
             horizon_minutes=horizon_minutes,
@@ -111,16 +165,29 @@ class PredictionTracker:
             confidence=confidence,
         )
         
-        self.predictions.append(record)
+        self._remember(record)
         self.pending_validations[record.id] = record
+        heapq.heappush(
+            self._expiry_heap,
+            (record.timestamp + timedelta(minutes=horizon_minutes), record.id)
+        )
         
+        # Loguru formats the args only if INFO is enabled
         logger.info(
-            f"📊 Logged prediction: {asset} @ ${entry_price:.2f} | "
-            f"P(Up)={p_up*100:.1f}% | {horizon_minutes}m horizon | {confidence} confidence"
+            "📊 Logged prediction: {} @ ${:.2f} | P(Up)={:.1%} | {}m horizon | {} confidence",
+            asset, entry_price, p_up, horizon_minutes, confidence
         )
         
         return record
     
+    def _remember(self, record: PredictionRecord):
+        """Append to the bounded history and the per-asset index, evicting from both together."""
+        if len(self.predictions) == self.predictions.maxlen:
+            evicted = self.predictions[0]
+            self._by_asset[evicted.asset].popleft()
+        self.predictions.append(record)
+        self._by_asset[record.asset].append(record)
+    
     async def start_validation_loop(self):
         """Background task to validate expired predictions."""
         self._running = True
@@ -129,6 +196,8 @@ class PredictionTracker:
         while self._running:
             try:
                 await self._validate_expired_predictions()
+                if self._unsaved:
+                    await self._flush_history()
                 await asyncio.sleep(10)  # Check every 10 seconds
             except Exception as e:
                 logger.error(f"Validation loop error: {e}")
@@ -138,37 +207,64 @@ class PredictionTracker:
         """Stop the validation loop."""
         self._running = False
     
+    def close(self):
+        """
+        Write any unflushed validations and close the journal.
+        Call after the validation task has finished.
+        """
+        pending, self._unsaved = self._unsaved, []
+        try:
+            with self._journal_lock:
+                if pending:
+                    self._append_journal(b"".join(pending))
+                if self._journal_fp is not None:
+                    self._journal_fp.close()
+                    self._journal_fp = None
+        except Exception as e:
+            logger.warning(f"Could not save prediction history: {e}")
+    
     async def _validate_expired_predictions(self):
         """Check and validate any predictions past their horizon."""
         now = datetime.utcnow()
         to_validate = []
         
-        for pred_id, pred in list(self.pending_validations.items()):
-            try:
-                # Handle timezone-aware timestamps by removing tzinfo for comparison
-                pred_ts = pred.timestamp.replace(tzinfo=None) if pred.timestamp.tzinfo else pred.timestamp
-                expiry = pred_ts + timedelta(minutes=pred.horizon_minutes)
-                if now >= expiry:
-                    to_validate.append(pred)
-            except Exception as e:
-                logger.warning(f"Error checking prediction {pred_id}: {e}")
-                continue
+        # Pop only the predictions whose horizon has passed; the rest stay in the heap
+        while self._expiry_heap and self._expiry_heap[0][0] <= now:
+            _, pred_id = heapq.heappop(self._expiry_heap)
+            pred = self.pending_validations.get(pred_id)
+            if pred is not None:
+                to_validate.append(pred)
+        
+        if not to_validate:
+            return
         
+        if not self.data_service:
+            # Fallback: can't validate without data service
+            for pred in to_validate:
+                logger.warning(f"No data service, skipping validation for {pred.id}")
+                del self.pending_validations[pred.id]
+            return
+        
+        # One price fetch per distinct asset, all assets concurrently
+        by_asset: Dict[str, List[PredictionRecord]] = defaultdict(list)
         for pred in to_validate:
-            await self._validate_prediction(pred)
+            by_asset[pred.asset].append(pred)
+        
+        results = await asyncio.gather(
+            *(self.data_service.get_latest_data(asset) for asset in by_asset),
+            return_exceptions=True,
+        )
+        
+        for preds, data in zip(by_asset.values(), results):
+            for pred in preds:
+                self._validate_prediction(pred, data)
     
-    async def _validate_prediction(self, pred: PredictionRecord):
-        """Validate a single prediction."""
+    def _validate_prediction(self, pred: PredictionRecord, data):
+        """Validate a single prediction against the latest market data for its asset."""
         try:
-            # Get current price
-            if self.data_service:
-                data = await self.data_service.get_latest_data(pred.asset)
-                exit_price = data.get('price', 0)
-            else:
-                # Fallback: can't validate without data service
-                logger.warning(f"No data service, skipping validation for {pred.id}")
-                del self.pending_validations[pred.id]
-                return
+            if isinstance(data, Exception):
+                raise data
+            exit_price = data.get('price', 0)
             
             # Calculate actual move
             actual_move = (exit_price - pred.entry_price) / pred.entry_price
@@ -183,60 +279,61 @@ class PredictionTracker:
             pred.actual_move = actual_move
             pred.prediction_correct = prediction_correct
             pred.validated_at = datetime.utcnow()
+            pred.validated_at_iso = _to_utc_iso(pred.validated_at)
             
             # Update stats
-            self.total_predictions += 1
-            if prediction_correct:
-                self.correct_predictions += 1
-            
-            # Update confidence-specific stats
-            if pred.confidence in self.stats_by_confidence:
-                self.stats_by_confidence[pred.confidence]['total'] += 1
-                if prediction_correct:
-                    self.stats_by_confidence[pred.confidence]['correct'] += 1
+            self._count_validation(pred)
             
-            # Log result
-            result_emoji = "✅" if prediction_correct else "❌"
-            accuracy = (self.correct_predictions / self.total_predictions * 100) if self.total_predictions > 0 else 0
-            
-            logger.info(
-                f"{result_emoji} Validated: {pred.asset} | "
-                f"Entry: ${pred.entry_price:.2f} → Exit: ${exit_price:.2f} | "
-                f"Predicted: {'UP' if predicted_up else 'DOWN'} ({pred.p_up*100:.0f}%) | "
-                f"Actual: {actual_move*100:+.3f}% | "
-                f"Overall Accuracy: {accuracy:.1f}% ({self.correct_predictions}/{self.total_predictions})"
+            # Log result - lazy so the accuracy and labels are only built if INFO is enabled
+            logger.opt(lazy=True).info(
+                "{} Validated: {} | Entry: ${:.2f} → Exit: ${:.2f} | Predicted: {} ({:.0%}) | "
+                "Actual: {:+.3%} | Overall Accuracy: {}",
+                lambda: "✅" if prediction_correct else "❌",
+                lambda: pred.asset,
+                lambda: pred.entry_price,
+                lambda: exit_price,
+                lambda: 'UP' if predicted_up else 'DOWN',
+                lambda: pred.p_up,
+                lambda: actual_move,
+                lambda: self._accuracy_summary(),
             )
             
             # Remove from pending
             del self.pending_validations[pred.id]
             
-            # Save to disk
-            self._save_history()
+            # Queue for the once-per-tick flush to disk
+            self._unsaved.append(json_dumps(pred.to_dict()) + b"\n")
             
         except Exception as e:
             logger.error(f"Error validating prediction {pred.id}: {e}")
-            del self.pending_validations[pred.id]
+            self.pending_validations.pop(pred.id, None)
+    
+    def _count_validation(self, pred: PredictionRecord):
+        """Fold a validated prediction into the running accuracy stats."""
+        self.total_predictions += 1
+        if pred.prediction_correct:
+            self.correct_predictions += 1
+        
+        # Update confidence-specific stats
+        if pred.confidence in self.stats_by_confidence:
+            self.stats_by_confidence[pred.confidence]['total'] += 1
+            if pred.prediction_correct:
+                self.stats_by_confidence[pred.confidence]['correct'] += 1
+    
+    def _accuracy_summary(self) -> str:
+        accuracy = (self.correct_predictions / self.total_predictions * 100) if self.total_predictions > 0 else 0
+        return f"{accuracy:.1f}% ({self.correct_predictions}/{self.total_predictions})"
     
     def get_history(self, limit: int = 50, asset: Optional[str] = None) -> List[dict]:
         """Get prediction history."""
-        history = list(self.predictions)
-        
-        if asset:
-            history = [p for p in history if p.asset == asset]
-        
-        # Return most recent first, only validated ones
-        validated = [p for p in history if p.validated_at is not None]
-        
-        # Sort with timezone-safe comparison
-        def safe_timestamp(p):
-            ts = p.timestamp
-            if ts and ts.tzinfo:
-                return ts.replace(tzinfo=None)
-            return ts or datetime.min
-        
-        validated.sort(key=safe_timestamp, reverse=True)
+        # Return most recent first, only validated ones. Timestamps are all naive UTC,
+        # but replayed history isn't strictly in timestamp order, so select rather than slice.
+        validated = (
+            p for p in (self._by_asset.get(asset, ()) if asset else self.predictions)
+            if p.validated_at is not None
+        )
         
-        return [p.to_dict() for p in validated[:limit]]
+        return [p.to_dict() for p in heapq.nlargest(limit, validated, key=attrgetter('timestamp'))]
     
     def get_stats(self) -> dict:
         """Get prediction accuracy statistics."""
@@ -264,24 +361,16 @@ class PredictionTracker:
     
     def get_pending(self) -> List[dict]:
         """Get predictions waiting for validation."""
-        pending = list(self.pending_validations.values())
-        
-        # Sort with timezone-safe comparison
-        def safe_timestamp(p):
-            ts = p.timestamp
-            if ts and ts.tzinfo:
-                return ts.replace(tzinfo=None)
-            return ts or datetime.min
-        
-        pending.sort(key=safe_timestamp, reverse=True)
-        return [p.to_dict() for p in pending]
+        # Pending records are only ever added by log_prediction, so insertion order is newest last
+        return [p.to_dict() for p in reversed(self.pending_validations.values())]
     
     def _load_history(self):
         """Load prediction history from disk."""
         try:
-            if self.HISTORY_FILE.exists():
-                with open(self.HISTORY_FILE, 'r') as f:
-                    data = json.load(f)
+            if self.HISTORY_FILE.exists() and self.HISTORY_FILE.stat().st_size > self.MAX_LOAD_BYTES:
+                logger.warning(f"Prediction history {self.HISTORY_FILE} exceeds {self.MAX_LOAD_BYTES} bytes, skipping load")
+            elif self.HISTORY_FILE.exists():
+                data = json_loads(self.HISTORY_FILE.read_bytes())
                 
                 # Restore stats
                 self.total_predictions = data.get('total_predictions', 0)
@@ -295,50 +384,108 @@ class PredictionTracker:
                 # Restore validated predictions
                 for p_dict in data.get('history', []):
                     try:
-                        record = PredictionRecord(
-                            id=p_dict['id'],
-                            asset=p_dict['asset'],
-                            timestamp=datetime.fromisoformat(p_dict['timestamp']),
-                            horizon_minutes=p_dict['horizon_minutes'],
-                            entry_price=p_dict['entry_price'],
-                            p_up=p_dict['p_up'],
-                            p_down=p_dict['p_down'],
-                            expected_move=p_dict['expected_move'],
-                            regime=p_dict['regime'],
-                            confidence=p_dict['confidence'],
-                            exit_price=p_dict.get('exit_price'),
-                            actual_move=p_dict.get('actual_move'),
-                            prediction_correct=p_dict.get('prediction_correct'),
-                            validated_at=datetime.fromisoformat(p_dict['validated_at']) if p_dict.get('validated_at') else None,
-                        )
-                        self.predictions.append(record)
+                        self._remember(self._record_from_dict(p_dict))
                     except Exception as e:
                         logger.warning(f"Failed to restore prediction: {e}")
-                
+            
+            self._journal_writes = self._replay_journal()
+            
+            if self.predictions:
                 logger.info(f"📂 Loaded {len(self.predictions)} predictions from history (Accuracy: {self.total_predictions}/{self.correct_predictions})")
         except Exception as e:
             logger.warning(f"Could not load prediction history: {e}")
     
-    def _save_history(self):
-        """Save prediction history to disk."""
+    @staticmethod
+    def _record_from_dict(p_dict: dict) -> PredictionRecord:
+        """Rebuild a record from its to_dict() form."""
+        return PredictionRecord(
+            id=p_dict['id'],
+            asset=p_dict['asset'],
+            timestamp=_parse_utc_iso(p_dict['timestamp']),
+            horizon_minutes=p_dict['horizon_minutes'],
+            entry_price=p_dict['entry_price'],
+            p_up=p_dict['p_up'],
+            p_down=p_dict['p_down'],
+            expected_move=p_dict['expected_move'],
+            regime=p_dict['regime'],
+            confidence=p_dict['confidence'],
+            exit_price=p_dict.get('exit_price'),
+            actual_move=p_dict.get('actual_move'),
+            prediction_correct=p_dict.get('prediction_correct'),
+            validated_at=_parse_utc_iso(p_dict['validated_at']) if p_dict.get('validated_at') else None,
+        )
+    
+    def _replay_journal(self) -> int:
+        """Apply validations journaled after the last snapshot. Returns the number replayed."""
+        if not self.JOURNAL_FILE.exists():
+            return 0
+        
+        # A crash between snapshot and journal truncation leaves entries already in the snapshot
+        seen = {p.id for p in self.predictions}
+        replayed = 0
+        with open(self.JOURNAL_FILE, 'rb') as f:
+            for line in f:
+                try:
+                    record = self._record_from_dict(json_loads(line))
+                except Exception as e:
+                    logger.warning(f"Failed to replay journaled prediction: {e}")
+                    continue
+                if record.id in seen:
+                    continue
+                seen.add(record.id)
+                self._remember(record)
+                self._count_validation(record)
+                replayed += 1
+        return replayed
+    
+    async def _flush_history(self):
+        """Journal this tick's validations in one write, compacting into the snapshot every COMPACT_EVERY."""
+        pending, self._unsaved = self._unsaved, []
+        writes = self._journal_writes + len(pending)
+        snapshot = self._snapshot() if writes >= self.COMPACT_EVERY else None
+        
         try:
-            # Ensure directory exists
-            self.HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Get validated predictions only
-            validated = [p for p in self.predictions if p.validated_at is not None]
-            
-            data = {
-                'total_predictions': self.total_predictions,
-                'correct_predictions': self.correct_predictions,
-                'stats_by_confidence': self.stats_by_confidence,
-                'history': [p.to_dict() for p in validated[-100:]],  # Keep last 100
-                'saved_at': datetime.utcnow().isoformat(),
-            }
-            
-            with open(self.HISTORY_FILE, 'w') as f:
-                json.dump(data, f, indent=2)
-                
+            await asyncio.to_thread(self._write_history, b"".join(pending), snapshot)
         except Exception as e:
+            # Keep the lines for the next tick; replay dedupes by id if some already landed
+            self._unsaved[:0] = pending
             logger.warning(f"Could not save prediction history: {e}")
+            return
+        
+        self._journal_writes = 0 if snapshot is not None else writes
+    
+    def _write_history(self, lines: bytes, snapshot: Optional[dict]):
+        """Append to the journal and, if given, atomically replace the snapshot (runs in a thread)."""
+        with self._journal_lock:
+            self._append_journal(lines)
+            if snapshot is not None:
+                self._write_snapshot(snapshot)
+                self._journal_fp.truncate(0)
+    
+    def _append_journal(self, lines: bytes):
+        """Append lines to the journal, opening it on first use. Caller holds _journal_lock."""
+        if self._journal_fp is None:
+            self.JOURNAL_FILE.parent.mkdir(parents=True, exist_ok=True)
+            self._journal_fp = open(self.JOURNAL_FILE, 'ab', buffering=0)
+        self._journal_fp.write(lines)
+    
+    def _snapshot(self) -> dict:
+        """Build the snapshot payload (on the event loop, so the deque isn't mutated mid-read)."""
+        # Get validated predictions only
+        validated = [p for p in self.predictions if p.validated_at is not None]
+        
+        return {
+            'total_predictions': self.total_predictions,
+            'correct_predictions': self.correct_predictions,
+            'stats_by_confidence': self.stats_by_confidence,
+            'history': [p.to_dict() for p in validated[-100:]],  # Keep last 100
+            'saved_at': datetime.utcnow().isoformat(),
+        }
+    
+    def _write_snapshot(self, data: dict):
+        """Write the snapshot via a temp file so a crash never leaves it half-written."""
+        self.HISTORY_FILE.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.HISTORY_FILE.with_suffix('.json.tmp')
+        tmp.write_bytes(json_dumps(data))
+        os.replace(tmp, self.HISTORY_FILE)
 
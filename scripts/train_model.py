@@ -33,27 +33,35 @@ def generate_synthetic_data(days: int = 90) -> pd.DataFrame:
         freq='H'
     )
     
+    # All Gaussian draws in one block: returns, open, high and low noise
+    rng = np.random.default_rng(42)
+    noise = np.empty((4, periods))
+    rng.standard_normal(out=noise)
+    
     # Generate random walk price
-    np.random.seed(42)
-    returns = np.random.normal(0.0001, 0.01, periods)
+    returns = noise[0] * 0.01 + 0.0001
     price = 40000 * np.exp(np.cumsum(returns))
     
     # Add some structure
     volatility = 0.01 + 0.005 * np.sin(np.arange(periods) * 2 * np.pi / 168)  # Weekly cycle
     
+    open_ = price * (1 + noise[1] * 0.001)
+    high = price * (1 + np.abs(noise[2]) * volatility)
+    low = price * (1 - np.abs(noise[3]) * volatility)
+    volume = rng.exponential(100, periods)
+    
+    # Ensure high >= low - reduce over the stacked arrays rather than row-wise in pandas
+    ohlc = np.stack([open_, high, low, price])
+    
     df = pd.DataFrame({
         'timestamp': timestamps,
-        'open': price * (1 + np.random.normal(0, 0.001, periods)),
-        'high': price * (1 + np.abs(np.random.normal(0, volatility))),
-        'low': price * (1 - np.abs(np.random.normal(0, volatility))),
+        'open': open_,
+        'high': ohlc.max(axis=0),
+        'low': ohlc.min(axis=0),
         'close': price,
-        'volume': np.random.exponential(100, periods),
+        'volume': volume,
     })
     
-    # Ensure high >= low
-    df['high'] = df[['open', 'high', 'low', 'close']].max(axis=1)
-    df['low'] = df[['open', 'high', 'low', 'close']].min(axis=1)
-    
     return df.set_index('timestamp')
 
 
@@ -120,11 +128,11 @@ def train_models(asset: str, days: int, output_dir: Path):
     volatility_model.save(output_dir / "volatility_model.pkl")
     
     # Save metadata
-    import pickle
+    import json
     metadata = {
         "asset": asset,
         "training_days": days,
-        "last_trained": datetime.utcnow(),
+        "last_trained": datetime.utcnow().isoformat(),
         "validation_metrics": {
             "direction": dir_metrics,
             "magnitude": mag_metrics,
@@ -132,8 +140,8 @@ def train_models(asset: str, days: int, output_dir: Path):
         "features": list(X.columns),
     }
     
-    with open(output_dir / "metadata.pkl", "wb") as f:
-        pickle.dump(metadata, f)
+    with open(output_dir / "metadata.json", "w") as f:
+        json.dump(metadata, f, indent=2)
     
     logger.info(f"Models saved to {output_dir}")
     